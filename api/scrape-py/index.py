@@ -8,8 +8,11 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
 
+from datetime import datetime
+
 try:
-    from polymarket_scraper import PolymarketScraper
+    from polymarket_scraper import refresh_snapshot_if_stale
+    from polymarket_store import MarketStore
     import pandas as pd
 except ImportError:
     # Fallback implementation
@@ -57,36 +60,34 @@ def handler(req):
             query = dict(urllib.parse.parse_qsl(query))
         
         max_pages = int(query.get('pages', '3'))
-        category = query.get('category', None)  # 'tech' 등 카테고리 필터
+        category = query.get('category', None)  # 'tech' 등 카테고리 필터 (마켓 태그로 거름)
+        companies = [c.strip() for c in query.get('company', '').split(',') if c.strip()]  # 기업 필터
+        insider_only = query.get('insider', 'false').lower() == 'true'
         
-        # Try to use PolymarketScraper if available
+        # 새로고침 데몬(python -m polymarket_scraper serve)이 발행한 스냅샷만 읽음
         try:
-            scraper = PolymarketScraper()
-            if category:
-                df = scraper.scrape_all_markets(max_pages=max_pages, use_selenium=False, category=category)
-            else:
-                df = scraper.scrape_all_markets(max_pages=max_pages, use_selenium=False)
+            store = MarketStore()
+            # 스냅샷이 없거나 오래되었으면 수집 캐시를 거쳐 다시 발행 (실패하면 기존 스냅샷 사용)
+            snapshot = refresh_snapshot_if_stale(store, max_pages=max_pages)
+            
+            # 기업/정보 우위 필터는 저장소 인덱스 조회로, 카테고리는 전체 스냅샷에서 마켓 태그로 고름
+            df = store.query_markets(category='all', tag=category, companies=companies, insider_only=insider_only)
             
             # DataFrame을 dict로 변환할 때 conditionId 포함
             markets_list = []
             if len(df) > 0:
-                for _, row in df.iterrows():
-                    market_dict = row.to_dict()
-                    # conditionId가 없으면 추가 시도
-                    if 'conditionId' not in market_dict or not market_dict.get('conditionId'):
-                        # link에서 slug 추출하여 conditionId로 사용
-                        link = market_dict.get('link', '')
-                        if link:
-                            import re
-                            slug_match = re.search(r'/event/([^/?]+)', link)
-                            if slug_match:
-                                market_dict['conditionId'] = slug_match.group(1)
-                    markets_list.append(market_dict)
+                # conditionId가 없으면 link의 slug를 conditionId로 사용
+                slugs = df['link'].fillna('').str.extract(r'/event/([^/?]+)', expand=False).fillna('')
+                df['conditionId'] = df['conditionId'].where(df['conditionId'].fillna('') != '', slugs)
+                # 호가/거래량이 없는 값(NaN)은 JSON null로
+                df = df.astype(object).where(df.notna(), None)
+                markets_list = df.to_dict('records')
             
             result = {
                 'success': True,
                 'count': len(markets_list),
                 'markets': markets_list,
+                'snapshot': snapshot,
                 'timestamp': datetime.now().isoformat()
             }
             
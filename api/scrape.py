@@ -4,11 +4,13 @@ Vercel Serverless Function for Polymarket scraping
 import json
 import sys
 import os
+from datetime import datetime
 
 # Add parent directory to path to import scraper
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from polymarket_scraper import PolymarketScraper
+from polymarket_scraper import refresh_snapshot_if_stale
+from polymarket_store import MarketStore
 
 def handler(req):
     """Vercel Serverless Function handler"""
@@ -34,16 +36,19 @@ def handler(req):
         use_selenium = query.get('selenium', 'false').lower() == 'true'
         max_pages = int(query.get('pages', '5'))
         
-        # Scrape markets
-        scraper = PolymarketScraper()
-        df = scraper.scrape_all_markets(max_pages=max_pages, use_selenium=use_selenium)
+        # 새로고침 데몬이 발행한 스냅샷 읽기 (없거나 오래되었으면 수집 캐시를 거쳐 다시 발행)
+        store = MarketStore()
+        snapshot = refresh_snapshot_if_stale(store, max_pages=max_pages, use_selenium=use_selenium)
+        df = store.query_markets()
         
-        # Convert DataFrame to JSON
+        # Convert DataFrame to JSON (NaN → null)
+        df = df.astype(object).where(df.notna(), None)
         result = {
             'success': True,
             'count': len(df),
             'markets': df.to_dict('records') if len(df) > 0 else [],
-            'timestamp': str(pd.Timestamp.now())
+            'snapshot': snapshot,
+            'timestamp': datetime.now().isoformat()
         }
         
         return {
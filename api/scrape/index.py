@@ -8,10 +8,14 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../'))
 
+from datetime import datetime
+
 try:
-    from polymarket_scraper import PolymarketScraper
+    from polymarket_scraper import refresh_snapshot_if_stale
+    from polymarket_store import MarketStore
     import pandas as pd
 except ImportError:
+    MarketStore = None
     # Fallback for Vercel environment
     import requests
     from bs4 import BeautifulSoup
@@ -60,6 +64,25 @@ def handler(req):
         
         max_pages = int(query.get('pages', '3'))
         
+        # 스크래퍼 모듈이 있으면 새로고침 데몬이 발행한 스냅샷 읽기 (없거나 오래되었으면 다시 발행)
+        if MarketStore is not None:
+            store = MarketStore()
+            snapshot = refresh_snapshot_if_stale(store, max_pages=max_pages)
+            df = store.query_markets()
+            df = df.astype(object).where(df.notna(), None)
+            result = {
+                'success': True,
+                'count': len(df),
+                'markets': df.to_dict('records'),
+                'snapshot': snapshot,
+                'timestamp': datetime.now().isoformat()
+            }
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': json.dumps(result, default=str)
+            }
+        
         # Simple scraping
         session = requests.Session()
         session.headers.update({
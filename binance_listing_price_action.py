@@ -19,6 +19,8 @@ import time
 import os
 import gc
 import warnings
+
+import rate_limiter
 warnings.filterwarnings('ignore')
 
 # Set matplotlib to use English fonts
@@ -31,7 +33,6 @@ plt.rcParams['axes.unicode_minus'] = False
 HOURS_TO_TRACK = 100          # Tracking period (hours)
 MINUTES_TO_TRACK = HOURS_TO_TRACK * 60  # 6000 minutes
 START_DATE = datetime(2023, 1, 1)
-API_DELAY = 0.5               # API call interval (seconds)
 BATCH_SIZE = 10               # Batch processing size
 SAVE_INTERVAL = 50            # Intermediate save interval
 
@@ -140,6 +141,8 @@ def safe_fetch_ohlcv(exchange, symbol, since_ts, limit=MINUTES_TO_TRACK):
                 # Batch size adjustment (800 per request - safer)
                 batch_limit = min(800, limit - len(all_data))
                 
+                # API rate limiting - wait for klines weight budget
+                rate_limiter.acquire('BINANCE_WEIGHT', tokens=rate_limiter.binance_klines_weight(batch_limit))
                 ohlcv = exchange.fetch_ohlcv(
                     symbol, 
                     timeframe='1m', 
@@ -158,9 +161,6 @@ def safe_fetch_ohlcv(exchange, symbol, since_ts, limit=MINUTES_TO_TRACK):
                 if len(ohlcv) > 0:
                     current_ts = ohlcv[-1][0] + 60000
                 
-                # API rate limiting - sufficient wait
-                time.sleep(API_DELAY)
-                
                 # Last batch if less data than requested
                 if len(ohlcv) < batch_limit:
                     break
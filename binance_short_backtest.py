@@ -13,11 +13,12 @@ import ccxt
 import pandas as pd
 from datetime import datetime
 from typing import Optional, Dict, List
-import time
 import os
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 
+import rate_limiter
+
 
 # ============================================================
 # 설정값 (필요시 수정)
@@ -27,7 +28,6 @@ STOP_LOSS_PCT = 0.10        # 손절 10%
 TAKE_PROFIT_PCT = 0.40      # 익절 40%
 TIMEOUT_HOURS = 72          # 타임아웃 72시간
 START_DATE = datetime(2023, 1, 1)  # 이 날짜 이후 상장 코인만
-API_DELAY = 1.0             # API 호출 간격 (초)
 
 # 출력 경로 (스크립트와 동일 폴더)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -78,6 +78,8 @@ def get_listings(exchange) -> List[Dict]:
 def get_ohlcv(exchange, symbol: str, since_ts: int, until_ts: int) -> Optional[pd.DataFrame]:
     """1시간봉 OHLCV 데이터 조회"""
     try:
+        # Rate Limit: klines weight 예산만큼 대기
+        rate_limiter.acquire('BINANCE_WEIGHT', tokens=rate_limiter.binance_klines_weight(1000))
         ohlcv = exchange.fetch_ohlcv(symbol, timeframe='1h', since=since_ts, limit=1000)
         if not ohlcv:
             return None
@@ -197,7 +199,6 @@ def run_backtest() -> List[Dict]:
                 'pnl_pct': None, 'holding_hours': None,
                 'max_drawdown': None, 'max_profit': None, 'status': 'SKIPPED'
             })
-            time.sleep(API_DELAY)
             continue
         
         # 실제 첫 거래 시점 = 첫 캔들
@@ -235,8 +236,6 @@ def run_backtest() -> List[Dict]:
                 'pnl_pct': None, 'holding_hours': None,
                 'max_drawdown': None, 'max_profit': None, 'status': 'INCOMPLETE'
             })
-        
-        time.sleep(API_DELAY)
     
     return results
 
@@ -0,0 +1,159 @@
+"""
+Browser Pool - 재사용 Headless Chrome
+=====================================
+Selenium 모드에서 매 호출마다 Chrome을 새로 띄우지 않도록, 프로세스 전체에서
+Headless Chrome 하나를 유지하며 페이지를 탭으로 렌더링합니다.
+
+고정 sleep 대신 마켓 카드(/event/ 링크) 수가 더 이상 늘지 않을 때까지
+명시적으로 대기하고, 여러 URL은 탭을 한꺼번에 열어 병렬로 로드합니다.
+"""
+
+import atexit
+import threading
+from typing import Dict, List, Optional
+
+try:
+    from selenium import webdriver
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    from selenium.webdriver.support.ui import WebDriverWait
+except ImportError:
+    webdriver = None
+
+# 스크롤 후 카드 수가 이 횟수만큼 연속으로 같으면 로드 완료로 판단
+STABLE_POLLS = 3
+POLL_INTERVAL = 0.25   # 초
+RENDER_TIMEOUT = 15    # 탭 하나의 최대 대기 시간 (초)
+MAX_TABS = 4           # 한 번에 여는 탭 수
+
+# 맨 아래로 스크롤하고 (문서 상태, 마켓 카드 수) 반환
+_SCROLL_AND_COUNT_JS = """
+window.scrollTo(0, document.body ? document.body.scrollHeight : 0);
+return [document.readyState, document.querySelectorAll('a[href*="/event/"]').length];
+"""
+
+
+class _CardCountSettled:
+    """WebDriverWait 조건: 문서 로드 완료 후 카드 수가 STABLE_POLLS번 연속 그대로인지"""
+
+    def __init__(self, stable_polls: int = STABLE_POLLS):
+        self.stable_polls = stable_polls
+        self.last_count = -1
+        self.stable = 0
+
+    def __call__(self, driver) -> bool:
+        ready_state, count = driver.execute_script(_SCROLL_AND_COUNT_JS)
+        if ready_state != 'complete' or count != self.last_count:
+            self.last_count = count
+            self.stable = 0
+            return False
+        self.stable += 1
+        return self.stable >= self.stable_polls
+
+
+class BrowserPool:
+    """재사용하는 Headless Chrome (스레드 간 공유, 한 번에 한 렌더링)"""
+
+    def __init__(self, headless: bool = True, max_tabs: int = MAX_TABS):
+        if webdriver is None:
+            raise ImportError("selenium is not installed")
+        self.headless = headless
+        self.max_tabs = max_tabs
+        self._driver = None
+        self._lock = threading.Lock()
+
+    def _new_driver(self):
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument('--headless=new')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        # 이미지는 마켓 파싱에 필요 없으므로 로드하지 않음
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.page_load_strategy = 'eager'
+        return webdriver.Chrome(options=options)
+
+    def _get_driver(self):
+        """살아있는 드라이버 반환 (없거나 죽었으면 새로 시작)"""
+        if self._driver is not None:
+            try:
+                self._driver.window_handles
+                return self._driver
+            except WebDriverException:
+                self._quit_driver()
+        self._driver = self._new_driver()
+        return self._driver
+
+    def _quit_driver(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except WebDriverException:
+                pass
+            self._driver = None
+
+    def close(self):
+        with self._lock:
+            self._quit_driver()
+
+    def render_pages(self, urls: List[str], timeout: float = RENDER_TIMEOUT) -> Dict[str, Optional[str]]:
+        """URL들을 탭으로 열어 렌더링된 HTML을 {url: html} 로 반환 (실패한 URL은 None)"""
+        results: Dict[str, Optional[str]] = {}
+        with self._lock:
+            for start in range(0, len(urls), self.max_tabs):
+                results.update(self._render_batch(urls[start:start + self.max_tabs], timeout))
+        return results
+
+    def _render_batch(self, urls: List[str], timeout: float) -> Dict[str, Optional[str]]:
+        driver = self._get_driver()
+        base_handle = driver.current_window_handle
+        tabs = []
+        try:
+            # 탭을 먼저 모두 열어 브라우저가 페이지들을 동시에 로드하게 함
+            for url in urls:
+                driver.switch_to.new_window('tab')
+                driver.execute_script("window.location.href = arguments[0];", url)
+                tabs.append((url, driver.current_window_handle))
+
+            results = {}
+            for url, handle in tabs:
+                driver.switch_to.window(handle)
+                try:
+                    WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(_CardCountSettled())
+                except TimeoutException:
+                    print(f"⚠️  렌더링 대기 시간 초과, 현재까지 로드된 내용 사용: {url}")
+                try:
+                    results[url] = driver.page_source
+                except WebDriverException as e:
+                    print(f"⚠️  페이지 렌더링 실패 ({url}): {e}")
+                    results[url] = None
+            return results
+        except WebDriverException:
+            # 드라이버 상태를 알 수 없으므로 다음 호출에서 새로 시작
+            self._quit_driver()
+            raise
+        finally:
+            if self._driver is not None:
+                for _, handle in tabs:
+                    try:
+                        driver.switch_to.window(handle)
+                        driver.close()
+                    except WebDriverException:
+                        pass
+                try:
+                    driver.switch_to.window(base_handle)
+                except WebDriverException:
+                    self._quit_driver()
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """프로세스 전체에서 공유하는 브라우저 풀 (처음 사용할 때 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
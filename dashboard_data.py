@@ -0,0 +1,119 @@
+"""
+Dashboard Data - 대시보드 파생 데이터
+=====================================
+Streamlit 대시보드는 위젯을 조작할 때마다 스크립트 전체를 다시 실행합니다.
+기업 목록, 기업별 마켓 수, 기업 explode 인덱스, 수집 시각 파싱처럼
+스냅샷에만 의존하는 값은 DashboardData로 스냅샷당 한 번만 계산하고,
+필터 결과(행 번호)에 대한 집계는 이 인덱스에서 벡터 연산으로 구합니다.
+
+기업 필터는 기업 → 행 번호 역색인의 합집합과 take 한 번으로 처리합니다
+(부분 문자열 비교가 아니므로 "meta"가 "metamask"에 걸리지 않음).
+"""
+
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = [25, 50, 100, 200]  # 마켓 목록 한 페이지에 그리는 마켓 수
+
+
+class DashboardData:
+    """스냅샷 하나의 파생 데이터 (df는 0부터 시작하는 행 번호 인덱스)"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.reset_index(drop=True)
+
+        if 'matched_companies' in self.df.columns:
+            companies = self.df['matched_companies'].fillna('').astype(str).str.split(', ').explode()
+            companies = companies[companies != '']
+        else:
+            companies = pd.Series([], dtype=object)
+        self.company_index = companies  # 행 번호 → 기업 (한 행이 여러 기업이면 여러 번)
+        self.company_counts = companies.value_counts()
+        self.companies: List[str] = sorted(self.company_counts.index)
+
+        # 기업 → 행 번호 배열 (오름차순) 역색인
+        codes, names = pd.factorize(companies.to_numpy())
+        order = np.argsort(codes, kind='stable')
+        rows = companies.index.to_numpy(dtype=np.int64)[order]
+        bounds = np.cumsum(np.bincount(codes, minlength=len(names)))[:-1]
+        self.company_rows = dict(zip(names, np.split(rows, bounds)))
+
+        if 'has_insider_potential' in self.df.columns:
+            self.insider = self.df['has_insider_potential'].fillna(False).astype(bool).to_numpy()
+        else:
+            self.insider = np.zeros(len(self.df), dtype=bool)
+
+        if 'scraped_at' in self.df.columns:
+            self.scraped_at = pd.to_datetime(self.df['scraped_at'], errors='coerce')
+        else:
+            self.scraped_at = pd.Series(pd.NaT, index=self.df.index)
+        self.latest_scraped_at = self.scraped_at.max()
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def filter_rows(self, companies: Iterable[str] = (), insider_only: bool = False,
+                    rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """선택한 기업 중 하나라도 포함하는 행 번호 (오름차순, 기업을 고르지 않으면 전체)
+
+        rows가 주어지면 그 행(예: 카테고리 뷰) 안에서만 고릅니다.
+        """
+        companies = list(companies)
+        if companies:
+            matched = [self.company_rows[company] for company in companies if company in self.company_rows]
+            selected = np.unique(np.concatenate(matched)) if matched else np.zeros(0, dtype=np.int64)
+            if rows is not None:
+                selected = np.intersect1d(selected, rows, assume_unique=True)
+        else:
+            selected = np.arange(len(self.df)) if rows is None else rows
+        if insider_only:
+            selected = selected[self.insider[selected]]
+        return selected
+
+    def filter(self, companies: Iterable[str] = (), insider_only: bool = False,
+               rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """기업/정보 우위 필터를 적용한 마켓 (인덱스는 스냅샷 행 번호 유지)"""
+        companies = list(companies)
+        if not companies and not insider_only and rows is None:
+            return self.df
+        return self.df.take(self.filter_rows(companies, insider_only, rows))
+
+    def companies_for(self, rows: Optional[np.ndarray] = None) -> List[str]:
+        """선택된 행들에 등장하는 기업 목록 (이름순)"""
+        return sorted(self.company_counts_for(rows).index)
+
+    def company_counts_for(self, rows: Optional[pd.Index] = None) -> pd.Series:
+        """선택된 행들의 기업별 마켓 수 (많은 순, rows가 None이면 전체)"""
+        if rows is None or len(rows) == len(self.df):
+            return self.company_counts
+        index = self.company_index
+        return index[index.index.isin(rows)].value_counts()
+
+    def tag_rows(self, tag: str) -> np.ndarray:
+        """태그 slug(예: 'tech')가 붙은 행 번호 (오름차순)"""
+        if 'tags' not in self.df.columns:
+            return np.zeros(0, dtype=np.int64)
+        padded = ', ' + self.df['tags'].fillna('').astype(str) + ', '
+        return np.flatnonzero(padded.str.contains(f", {tag.lower()}, ", regex=False).to_numpy())
+
+    def latest_scraped_at_for(self, rows: Optional[pd.Index] = None) -> Optional[pd.Timestamp]:
+        """선택된 행들의 최신 수집 시각 (없으면 None)"""
+        if rows is None or len(rows) == len(self.df):
+            latest = self.latest_scraped_at
+        else:
+            latest = self.scraped_at.loc[rows].max()
+        return None if pd.isna(latest) else latest
+
+
+def page_count(total: int, page_size: int) -> int:
+    """전체 페이지 수 (마켓이 없어도 1)"""
+    return max(1, -(-total // page_size))
+
+
+def page_slice(total: int, page_size: int, page: int) -> slice:
+    """해당 페이지의 위치 범위 (page는 1부터, 범위를 벗어나면 마지막 페이지)"""
+    page = min(max(1, page), page_count(total, page_size))
+    start = (page - 1) * page_size
+    return slice(start, min(start + page_size, total))
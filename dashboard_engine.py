@@ -0,0 +1,537 @@
+"""
+Dashboard Engine - 대시보드 공통 엔진
+=====================================
+polymarket_dashboard.py(전체)와 polymarket_tech_dashboard.py(Tech)가 함께 쓰는
+Streamlit 대시보드입니다. 두 진입점은 DashboardView(문구/태그)만 다릅니다.
+
+전체 수집 스냅샷의 마켓(universe)은 프로세스 전역으로 한 번만 읽어 DashboardData로
+보관하고, 카테고리 뷰는 마켓 태그로 고른 행 번호 집합으로 표현합니다. 수집은 전체
+마켓 한 번뿐이고, Tech 뷰는 별도 수집이나 두 번째 사본 없이 universe를 걸러서 보여줍니다.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from dashboard_data import PAGE_SIZES, DashboardData, page_count, page_slice
+from polymarket_realtime import get_realtime_subscriber, yes_token_ids
+from polymarket_store import MarketStore
+from refresh_job import STAGE_LABELS, RefreshJob, get_refresh_job, start_refresh
+
+REFRESH_POLL_INTERVAL = 1  # 새로고침 진행 상황 확인 간격 (초)
+REALTIME_POLL_INTERVAL = 0.5  # 실시간 가격을 마켓 목록에 다시 덮어쓰는 간격 (초, 가격 변화가 1초 안에 보이도록)
+
+# st.fragment(1.37+)가 있으면 진행 상황 영역만 주기적으로 다시 그림 (없으면 전체 rerun으로 확인)
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+
+class DashboardView(NamedTuple):
+    """대시보드 한 종류의 태그와 화면 문구"""
+    tag: Optional[str]           # 마켓 태그 slug로 거르는 뷰 (None이면 전체)
+    name: str                    # 뷰 선택에 표시하는 이름
+    page_title: str
+    page_icon: str
+    header: str
+    subtitle: str
+    label: str = ""              # "Tech " 처럼 마켓 앞에 붙는 말
+    badge: str = ""              # 통계 아래 표시하는 배지 HTML
+    help_extra: str = ""         # 사용 방법 아래에 붙는 설명
+    chart_options: Dict = {}     # px.bar 추가 인자
+    file_prefix: str = "polymarket_company_markets"
+
+
+ALL_VIEW = DashboardView(
+    tag=None,
+    name="📊 전체",
+    page_title="Polymarket 기업 마켓 대시보드",
+    page_icon="📊",
+    header="📊 Polymarket 기업 관련 마켓 대시보드",
+    subtitle="내부 정보 우위가 있을 수 있는 기업 관련 마켓을 필터링하여 보여줍니다.",
+)
+
+TECH_VIEW = DashboardView(
+    tag="tech",
+    name="💻 Tech",
+    page_title="Polymarket Tech 마켓 대시보드",
+    page_icon="💻",
+    header="💻 Polymarket Tech 마켓 대시보드",
+    subtitle="Tech 카테고리의 기업 관련 마켓을 필터링하여 보여줍니다.",
+    label="Tech ",
+    badge='<span class="tech-badge">💻 TECH 카테고리</span>',
+    help_extra="""
+    ### 💡 Tech 카테고리
+    - Polymarket에서 Tech 태그가 붙은 마켓만 표시됩니다.
+    - 기술 기업, 제품 출시, AI 관련 마켓 등이 포함됩니다.
+    """,
+    chart_options={'color': '마켓 수', 'color_continuous_scale': 'Blues'},
+    file_prefix="polymarket_tech_markets",
+)
+
+VIEWS = [ALL_VIEW, TECH_VIEW]
+
+CSS = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        font-weight: bold;
+        color: #1f77b4;
+        margin-bottom: 1rem;
+    }
+    .metric-card {
+        background-color: #f0f2f6;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        margin: 0.5rem 0;
+    }
+    .insider-badge {
+        background-color: #ff6b6b;
+        color: white;
+        padding: 0.25rem 0.5rem;
+        border-radius: 0.25rem;
+        font-size: 0.75rem;
+        font-weight: bold;
+    }
+    .tech-badge {
+        background-color: #4CAF50;
+        color: white;
+        padding: 0.25rem 0.5rem;
+        border-radius: 0.25rem;
+        font-size: 0.75rem;
+        font-weight: bold;
+    }
+</style>
+"""
+
+
+class Universe:
+    """전체 수집 스냅샷의 파생 데이터 + 태그별 행 번호 (스냅샷 버전별로 하나)"""
+
+    def __init__(self, key: Optional[int], data: DashboardData):
+        self.key = key
+        self.data = data
+        self._tag_rows: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def rows(self, tag: Optional[str]) -> Optional[np.ndarray]:
+        """태그 뷰의 행 번호 (전체면 None)"""
+        if not tag:
+            return None
+        with self._lock:
+            rows = self._tag_rows.get(tag)
+            if rows is None:
+                rows = self._tag_rows[tag] = self.data.tag_rows(tag)
+            return rows
+
+
+# 프로세스 전역 universe (같은 프로세스의 모든 세션/뷰가 공유)
+_universe: Optional[Universe] = None
+_universe_lock = threading.Lock()
+
+
+def get_universe(store: MarketStore) -> Universe:
+    """최신 전체 스냅샷 기준 universe (새 스냅샷이 발행되면 다시 읽음)"""
+    global _universe
+    snapshot = store.snapshot_info()
+    key = snapshot['version'] if snapshot else None
+    with _universe_lock:
+        if _universe is None or _universe.key != key:
+            _universe = Universe(key, DashboardData(store.query_markets(category='all')))
+        return _universe
+
+
+@st.cache_resource
+def get_store() -> MarketStore:
+    """SQLite 마켓 저장소 (프로세스 내 공유)"""
+    return MarketStore()
+
+
+SORT_COLUMNS = {
+    "제목": 'title',
+    "기업": 'matched_companies',
+    "정보 우위 가능성": 'has_insider_potential',
+    "유동성": 'liquidity',
+    "스프레드": 'spread',
+}
+
+
+# 아래 캐시는 (universe 버전, 뷰, 필터[, 정렬]) 조합별로 한 번만 계산 → rerun 비용이 스냅샷 크기와 무관
+# (_universe 인자는 해시하지 않음, universe_key가 같으면 같은 universe)
+@st.cache_resource(max_entries=32)
+def _filtered_rows(universe_key: Optional[int], tag: Optional[str], companies: Tuple[str, ...],
+                   insider_only: bool, _universe: Universe) -> np.ndarray:
+    """뷰 + 기업/정보 우위 필터를 적용한 행 번호 (오름차순)"""
+    return _universe.data.filter_rows(companies, insider_only, rows=_universe.rows(tag))
+
+
+class FilterStats(NamedTuple):
+    """필터 결과 집계 (통계 카드와 기업 분포 차트용)"""
+    new_count: int
+    insider_count: int
+    company_counts: pd.Series
+    latest_scraped_at: Optional[pd.Timestamp]
+
+
+@st.cache_resource(max_entries=32)
+def _filter_stats(universe_key: Optional[int], tag: Optional[str], companies: Tuple[str, ...],
+                  insider_only: bool, _universe: Universe) -> FilterStats:
+    """필터 결과 행 번호 배열에서 바로 집계"""
+    data = _universe.data
+    rows = _filtered_rows(universe_key, tag, companies, insider_only, _universe)
+    new_count = int(data.df['is_new'].to_numpy()[rows].sum()) if 'is_new' in data.df.columns else 0
+    return FilterStats(new_count, int(data.insider[rows].sum()), data.company_counts_for(rows),
+                       data.latest_scraped_at_for(rows))
+
+
+@st.cache_resource(max_entries=4)
+def _view_companies(universe_key: Optional[int], tag: Optional[str], _universe: Universe) -> List[str]:
+    """뷰에 등장하는 기업 목록 (기업 필터 선택지)"""
+    return _universe.data.companies_for(_universe.rows(tag))
+
+
+@st.cache_resource(max_entries=32)
+def _sorted_rows(universe_key: Optional[int], tag: Optional[str], companies: Tuple[str, ...],
+                 insider_only: bool, sort_by: str, ascending: bool, _universe: Universe) -> np.ndarray:
+    """필터 결과 행 번호를 정렬 기준 순서로"""
+    rows = _filtered_rows(universe_key, tag, companies, insider_only, _universe)
+    column = SORT_COLUMNS[sort_by]
+    df = _universe.data.df
+    if column not in df.columns:
+        return rows
+    # df는 0부터 시작하는 행 번호 인덱스 → 정렬된 인덱스가 곧 행 번호
+    values = df[column].take(rows)
+    return values.sort_values(ascending=ascending, na_position='last', kind='stable').index.to_numpy()
+
+
+@st.cache_resource(max_entries=8)
+def _csv_bytes(universe_key: Optional[int], tag: Optional[str], companies: Tuple[str, ...],
+               insider_only: bool, _universe: Universe) -> bytes:
+    """필터 결과 CSV (UTF-8 BOM)"""
+    rows = _filtered_rows(universe_key, tag, companies, insider_only, _universe)
+    return _universe.data.df.take(rows).to_csv(index=False, encoding='utf-8-sig').encode('utf-8-sig')
+
+
+@st.cache_resource(max_entries=4)
+def _view_token_ids(universe_key: Optional[int], tag: Optional[str], _universe: Universe) -> List[str]:
+    """뷰 전체 마켓의 Yes 토큰 id (실시간 가격 구독용)"""
+    return yes_token_ids(_universe.data.filter(rows=_universe.rows(tag)))
+
+
+def _render_table(df_page: pd.DataFrame):
+    table_columns = [column for column in ['title', 'matched_companies', 'has_insider_potential', 'midpoint',
+                                           'spread', 'liquidity', 'link'] if column in df_page.columns]
+    st.dataframe(
+        df_page[table_columns],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'title': '제목',
+            'matched_companies': '관련 기업',
+            'has_insider_potential': st.column_config.CheckboxColumn('정보 우위'),
+            'midpoint': st.column_config.NumberColumn('중간가', format="%.3f"),
+            'spread': st.column_config.NumberColumn('스프레드', format="%.3f"),
+            'liquidity': st.column_config.NumberColumn('유동성', format="%.0f"),
+            'link': st.column_config.LinkColumn('링크', display_text="🔗 Polymarket"),
+        },
+    )
+
+
+def _render_cards(df_page: pd.DataFrame):
+    for idx, row in df_page.iterrows():
+        with st.container():
+            col_title, col_badge = st.columns([5, 1])
+
+            with col_title:
+                title = row.get('title', '제목 없음')
+                new_marker = "🆕 " if row.get('is_new', False) else ""
+                st.markdown(f"### {new_marker}{title}")
+
+            with col_badge:
+                if row.get('has_insider_potential', False):
+                    st.markdown('<span class="insider-badge">🎯 정보 우위</span>', unsafe_allow_html=True)
+                    if row.get('insider_signal'):
+                        st.caption(f"근거: {row['insider_signal']}")
+                if pd.notna(row.get('midpoint')):
+                    st.caption(f"💹 {row['midpoint']:.3f} · 스프레드 {row['spread']:.3f}")
+
+            # 메타 정보
+            meta_col1, meta_col2, meta_col3 = st.columns(3)
+
+            with meta_col1:
+                companies = row.get('matched_companies', 'N/A')
+                st.write(f"**관련 기업:** {companies}")
+
+            with meta_col2:
+                description = row.get('description', '')
+                if description:
+                    st.write(f"**설명:** {description[:100]}...")
+
+            with meta_col3:
+                link = row.get('link', '')
+                if link:
+                    st.markdown(f"[🔗 Polymarket에서 보기]({link})")
+                else:
+                    st.write("링크 없음")
+
+            st.divider()
+
+
+def _render_refresh_status(job: RefreshJob, label: str) -> bool:
+    """새로고침 진행 상황/결과 표시, 이 세션이 처음 보는 완료면 True"""
+    status = job.status()
+    stage = STAGE_LABELS.get(status['stage'], status['stage'])
+    counts = f"페이지 {status['pages']}개 · 마켓 {status['markets']}개 · 기업 마켓 {status['classified']}개"
+    if status['running']:
+        st.info(f"⏳ {label}마켓 새로고침 중 ({stage}, {status['elapsed']:.0f}초)\n\n{counts}")
+        st.caption("수집이 끝날 때까지 이전 스냅샷을 보여줍니다.")
+        return False
+    if status['error']:
+        st.error(f"❌ 새로고침 실패: {status['error']}")
+        st.info("💡 팁: Selenium을 사용하려면 `pip install selenium`을 실행하고 Chrome 브라우저가 설치되어 있어야 합니다.")
+    else:
+        st.success(f"✅ {status['classified']}개 {label}마켓 수집 완료! (v{status['version']}, {status['elapsed']:.0f}초)")
+
+    seen_key = f"refresh_seen_{job.category or 'all'}"
+    first_seen = st.session_state.get(seen_key) != job.job_id
+    st.session_state[seen_key] = job.job_id
+    return first_seen
+
+
+def _render_market_page(df_page: pd.DataFrame, view_mode: str, subscriber=None):
+    """마켓 목록 한 페이지 (구독기가 있으면 실시간 가격을 덮어써서)"""
+    if subscriber is not None:
+        df_page = subscriber.state.overlay(df_page)
+    if view_mode == "표":
+        _render_table(df_page)
+    else:
+        _render_cards(df_page)
+
+
+if _fragment is not None:
+    @_fragment(run_every=REALTIME_POLL_INTERVAL)
+    def _live_market_page(df_page: pd.DataFrame, view_mode: str, subscriber):
+        """실시간 가격이 켜져 있으면 마켓 목록만 주기적으로 다시 그림 (위젯 조작 없이도 가격 갱신)"""
+        _render_market_page(df_page, view_mode, subscriber)
+
+    @_fragment(run_every=REFRESH_POLL_INTERVAL)
+    def _poll_refresh_status(category: Optional[str], label: str):
+        """진행 중인 새로고침을 주기적으로 확인하고, 끝나면 전체 rerun으로 새 스냅샷 교체"""
+        job = get_refresh_job(category)
+        if job is not None and _render_refresh_status(job, label):
+            st.rerun()
+
+
+def run_dashboard(default_view: DashboardView = ALL_VIEW):
+    """대시보드 렌더링 (진입점 스크립트에서 호출)"""
+    st.set_page_config(
+        page_title=default_view.page_title,
+        page_icon=default_view.page_icon,
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(CSS, unsafe_allow_html=True)
+    store = get_store()
+
+    # 사이드바
+    with st.sidebar:
+        st.header("⚙️ 설정")
+
+        # 같은 universe의 다른 카테고리 뷰로 전환 (다시 수집하지 않음)
+        view_names = [view.name for view in VIEWS]
+        selected_name = st.radio("보기 범위", view_names, index=view_names.index(default_view.name), horizontal=True)
+        view = VIEWS[view_names.index(selected_name)]
+
+        # 새로고침 옵션
+        use_selenium = st.checkbox("Selenium 사용 (더 정확하지만 느림)", value=False)
+        incremental = st.checkbox("증분 동기화 (변경된 마켓만 수집)", value=True, disabled=use_selenium)
+        realtime_prices = st.checkbox("💹 실시간 가격 (WebSocket)", value=False)
+
+        # 새로고침 버튼 (전체 마켓을 백그라운드 스레드에서 수집, 그동안 이전 스냅샷을 계속 표시)
+        # 모든 뷰가 같은 전체 스냅샷을 태그로 거르므로 어느 뷰에서 눌러도 수집은 한 번
+        job = get_refresh_job(None)
+        refreshing = job is not None and job.running
+        if st.button("🔄 마켓 데이터 새로고침", use_container_width=True, disabled=refreshing):
+            job = start_refresh(store, None, max_pages=5, use_selenium=use_selenium,
+                                incremental=incremental, enrich=True)
+            refreshing = True
+
+        if refreshing and _fragment is not None:
+            _poll_refresh_status(None, "")
+        elif job is not None:
+            _render_refresh_status(job, "")
+
+        # 새로고침 데몬(python -m polymarket_scraper serve)이나 위 버튼이 새 스냅샷을 발행했으면 다시 읽음
+        universe = get_universe(store)
+        data = universe.data
+        view_rows = universe.rows(view.tag)
+
+        snapshot = store.snapshot_info()
+        if snapshot:
+            st.caption(f"📦 스냅샷 v{snapshot['version']} · {snapshot['refreshed_at'][:19]}")
+
+        st.divider()
+
+        # 필터 옵션
+        st.subheader("🔍 필터")
+
+        filter_insider_only = st.checkbox("내부 정보 우위 가능성만 보기", value=False)
+
+        # 기업 필터
+        selected_companies = st.multiselect(
+            "기업 선택",
+            options=_view_companies(universe.key, view.tag, universe),
+            default=[]
+        )
+
+        st.divider()
+
+        st.markdown(f"""
+        ### 📝 사용 방법
+        1. **마켓 데이터 새로고침** 버튼을 클릭하여 최신 마켓 데이터를 수집합니다.
+        2. 필터를 사용하여 관심 있는 기업이나 마켓을 찾습니다.
+        3. 마켓 카드를 클릭하여 Polymarket에서 자세히 확인합니다.
+        {view.help_extra}
+        ### 🎯 정보 우위 마켓
+        - 제품 출시일, 발표일 등 내부 정보를 가진 사람이 우위를 가질 수 있는 마켓
+        - 예: "OpenAI의 새 모델이 언제 출시될까?"
+        """)
+
+    # 헤더
+    st.markdown(f'<div class="main-header">{view.header}</div>', unsafe_allow_html=True)
+    st.markdown(f"**{view.subtitle}**")
+
+    # 메인 콘텐츠
+    if len(data) == 0 or (view_rows is not None and len(view_rows) == 0):
+        st.info("👈 사이드바에서 '마켓 데이터 새로고침' 버튼을 클릭하여 마켓 데이터를 수집하세요.")
+        st.warning("저장된 데이터가 없습니다. 먼저 데이터를 수집해주세요.")
+        st.stop()
+
+    # 필터 적용 (universe의 기업 → 행 번호 역색인, 태그 뷰 안에서, 결과는 조합별로 캐시)
+    filter_key = (universe.key, view.tag, tuple(selected_companies), filter_insider_only)
+    rows = _filtered_rows(*filter_key, universe)
+    stats = _filter_stats(*filter_key, universe)
+
+    # 통계 카드
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(f"총 {view.label}마켓 수", len(rows),
+                  delta=f"신규 {stats.new_count}" if stats.new_count else None)
+
+    with col2:
+        st.metric("정보 우위 가능성", stats.insider_count)
+
+    # 기업별 카운트 (universe의 기업 인덱스에서 필터된 행만 집계)
+    company_counts = stats.company_counts
+
+    with col3:
+        st.metric("관련 기업 수", len(company_counts))
+
+    with col4:
+        if stats.latest_scraped_at is not None:
+            st.metric("최신 업데이트", stats.latest_scraped_at.strftime("%Y-%m-%d %H:%M"))
+
+    st.divider()
+
+    if view.badge:
+        st.markdown(view.badge, unsafe_allow_html=True)
+        st.divider()
+
+    # 기업별 분포 차트
+    if len(rows) > 0:
+        col_chart, col_table = st.columns([2, 1])
+
+        with col_chart:
+            st.subheader(f"📈 기업별 {view.label}마켓 분포")
+
+            if len(company_counts) > 0:
+                company_df = pd.DataFrame({
+                    '기업': company_counts.index,
+                    '마켓 수': company_counts.to_numpy()
+                }).head(20)
+
+                chart_title = f"상위 20개 기업 ({view.label.strip()} 카테고리)" if view.tag else "상위 20개 기업"
+                fig = px.bar(
+                    company_df,
+                    x='마켓 수',
+                    y='기업',
+                    orientation='h',
+                    title=chart_title,
+                    labels={'마켓 수': '마켓 수', '기업': '기업명'},
+                    **view.chart_options
+                )
+                fig.update_layout(height=500)
+                st.plotly_chart(fig, use_container_width=True)
+
+        with col_table:
+            st.subheader("🏢 기업 목록")
+            company_list = sorted(company_counts.index)
+            for company in company_list[:30]:
+                st.write(f"- {company} ({company_counts[company]})")
+
+    st.divider()
+
+    # 마켓 목록
+    st.subheader(f"📋 {view.label}마켓 목록")
+
+    # 정렬 옵션
+    sort_col1, sort_col2 = st.columns(2)
+    with sort_col1:
+        sort_by = st.selectbox("정렬 기준", list(SORT_COLUMNS))
+    with sort_col2:
+        sort_order = st.selectbox("정렬 순서", ["오름차순", "내림차순"])
+
+    order = _sorted_rows(*filter_key, sort_by, sort_order == "오름차순", universe)
+
+    # 페이지 단위로 잘라서 표시 (렌더링 시간과 전송량이 스냅샷 크기가 아닌 페이지 크기에 비례)
+    view_col, size_col, page_col = st.columns([2, 1, 1])
+    with view_col:
+        view_mode = st.radio("보기", ["카드", "표"], horizontal=True)
+    with size_col:
+        page_size = st.selectbox("페이지당 마켓 수", PAGE_SIZES, index=1)
+    pages = page_count(len(order), page_size)
+    with page_col:
+        page = int(st.number_input(f"페이지 (총 {pages})", min_value=1, max_value=pages, value=1, step=1))
+    page_range = page_slice(len(order), page_size, page)
+    df_page = data.df.take(order[page_range])
+    if len(df_page) > 0:
+        st.caption(f"{len(order)}개 중 {page_range.start + 1}–{page_range.stop}번째 마켓")
+
+    # 실시간 가격 반영 (뷰의 전체 마켓을 구독하고, 화면에 그리는 페이지에만 메모리 상태를 덮어씀)
+    subscriber = None
+    if realtime_prices:
+        try:
+            subscriber = get_realtime_subscriber()
+            subscriber.set_tokens(_view_token_ids(universe.key, view.tag, universe))
+        except ImportError:
+            st.info("💡 실시간 가격을 사용하려면 `pip install websockets`를 실행하세요.")
+
+    if subscriber is not None and _fragment is not None:
+        _live_market_page(df_page, view_mode, subscriber)
+    else:
+        _render_market_page(df_page, view_mode, subscriber)
+    rendered_version = subscriber.state.version if subscriber is not None else None
+
+    # 데이터 다운로드 (필터 조합별로 한 번만 만든 CSV)
+    st.download_button(
+        label="📥 CSV 다운로드",
+        data=_csv_bytes(*filter_key, universe),
+        file_name=f"{view.file_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv"
+    )
+
+    # st.fragment가 없는 버전은 화면을 다 그린 뒤 기다렸다가, 새로고침 중이거나
+    # 실시간 가격이 바뀌었으면 전체 rerun
+    if _fragment is None and (refreshing or subscriber is not None):
+        placeholder = st.empty()
+        while True:
+            time.sleep(REALTIME_POLL_INTERVAL if subscriber is not None else REFRESH_POLL_INTERVAL)
+            if refreshing or subscriber.state.version != rendered_version:
+                st.rerun()
+            # 요소를 갱신해야 위젯 조작으로 들어온 rerun 요청이 이 실행을 중단시킴
+            placeholder.empty()
@@ -0,0 +1,76 @@
+"""
+Fingerprints - 64-bit 지문 집합
+================================
+마켓 키(conditionId 등)나 (conditionId, updatedAt) 조합을 64-bit 해시로 줄여
+정렬된 NumPy uint64 배열로 보관합니다. 문자열 set보다 훨씬 작고,
+.npy 파일로 저장해 다음 실행에서 그대로 불러올 수 있습니다.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Iterable, Optional
+
+import numpy as np
+
+# 새로 추가된 지문을 정렬 배열로 합치는 기준 개수
+COMPACT_THRESHOLD = 4096
+
+
+def fingerprint(*parts) -> int:
+    """문자열 조합의 64-bit 지문"""
+    data = '\x1f'.join('' if part is None else str(part) for part in parts).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+class FingerprintSet:
+    """정렬된 uint64 배열 + 최근 추가분 set으로 구성된 지문 집합"""
+
+    def __init__(self, fingerprints: Optional[Iterable[int]] = None):
+        values = np.fromiter(fingerprints, dtype=np.uint64) if fingerprints is not None else np.zeros(0, np.uint64)
+        self._sorted = np.unique(values)
+        self._recent = set()
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._recent)
+
+    def __contains__(self, value: int) -> bool:
+        if value in self._recent:
+            return True
+        i = np.searchsorted(self._sorted, np.uint64(value))
+        return bool(i < len(self._sorted) and self._sorted[i] == value)
+
+    def add(self, value: int) -> bool:
+        """지문 추가, 새로 추가되었으면 True"""
+        if value in self:
+            return False
+        self._recent.add(value)
+        if len(self._recent) >= COMPACT_THRESHOLD:
+            self._compact()
+        return True
+
+    def _compact(self):
+        if self._recent:
+            recent = np.fromiter(self._recent, dtype=np.uint64, count=len(self._recent))
+            self._sorted = np.union1d(self._sorted, recent)
+            self._recent.clear()
+
+    def save(self, path: str):
+        """.npy 파일로 저장 (임시 파일 후 교체)"""
+        self._compact()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # 프로세스/스레드별 임시 파일 → 동시에 저장해도 서로의 임시 파일을 덮어쓰지 않음
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+        np.save(tmp_path, self._sorted)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["FingerprintSet"]:
+        """저장된 집합 읽기 (없거나 손상되었으면 None)"""
+        try:
+            values = np.load(path)
+        except (OSError, ValueError):
+            return None
+        fingerprints = cls()
+        fingerprints._sorted = np.unique(values.astype(np.uint64, copy=False))
+        return fingerprints
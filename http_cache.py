@@ -0,0 +1,155 @@
+"""
+HTTP Cache - 조건부 GET 디스크 캐시
+===================================
+requests.Session에 마운트하는 HTTPAdapter입니다. GET 응답 본문을
+ETag/Last-Modified와 함께 디스크에 저장하고, 다음 요청에
+If-None-Match/If-Modified-Since를 붙여 304 응답이면 로컬 본문을 돌려줍니다.
+Cache-Control max-age 안의 요청은 네트워크 없이 바로 응답합니다.
+
+캐시된 응답도 urllib3 HTTPResponse로 만들어 돌려주므로
+stream=True / response.raw 기반 스트리밍 파싱이 그대로 동작합니다.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+# 본문 파일 복사 단위 (전체 본문을 메모리에 올리지 않음)
+COPY_CHUNK_SIZE = 64 * 1024
+
+# 캐시 본문은 디코딩된 상태로 저장하므로 전송 관련 헤더는 저장하지 않음
+_HOP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+_MAX_AGE_RE = re.compile(r'max-age\s*=\s*(\d+)', re.IGNORECASE)
+
+
+def _cache_control(headers) -> Dict:
+    """Cache-Control 헤더에서 no-store/no-cache/max-age 추출"""
+    value = (headers.get('Cache-Control') or '').lower()
+    match = _MAX_AGE_RE.search(value)
+    return {
+        'no_store': 'no-store' in value,
+        'no_cache': 'no-cache' in value,
+        'max_age': int(match.group(1)) if match else 0,
+    }
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """ETag/Last-Modified 재검증과 max-age를 지원하는 디스크 캐시 어댑터
+
+    캐시 항목은 URL별 파일 하나에 (메타 JSON 한 줄 + 본문)으로 저장하며,
+    파일 수정 시각을 마지막 검증 시각으로 사용합니다 (304면 시각만 갱신).
+    """
+
+    def __init__(self, cache_dir: str, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.stats = {'fresh': 0, 'revalidated': 0, 'stored': 0, 'miss': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def _load_meta(self, path: str) -> Optional[Dict]:
+        """캐시 항목의 메타 정보 (없거나 손상되었으면 None)"""
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+            meta['validated_at'] = os.path.getmtime(path)
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def _cached_response(self, request, path: str, meta: Dict, stream: bool):
+        """캐시 파일 본문을 읽는 requests.Response 생성 (stream이면 파일에서 바로 읽음)"""
+        body = open(path, 'rb')
+        body.readline()  # 메타 줄 건너뜀
+        if not stream:
+            with body:
+                body = io.BytesIO(body.read())
+        raw = HTTPResponse(
+            body=body,
+            headers=meta['headers'],
+            status=meta['status'],
+            reason='OK',
+            preload_content=False,
+            decode_content=False,
+            request_url=request.url,
+        )
+        response = self.build_response(request, raw)
+        response.from_cache = True
+        return response
+
+    def _store(self, request, response, path: str, control: Dict, stream: bool):
+        """200 응답 본문을 캐시 파일로 옮겨 쓰고 캐시 파일을 읽는 응답 반환"""
+        headers = {key: value for key, value in response.headers.items() if key.lower() not in _HOP_HEADERS}
+        meta = {
+            'url': request.url,
+            'status': response.status_code,
+            'headers': headers,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'max_age': 0 if control['no_cache'] else control['max_age'],
+        }
+        # 같은 URL을 동시에 받는 경우를 위해 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps(meta).encode('utf-8') + b'\n')
+                for chunk in response.raw.stream(COPY_CHUNK_SIZE, decode_content=True):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        finally:
+            response.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._count('stored')
+        return self._cached_response(request, path, self._load_meta(path), stream)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if request.method != 'GET':
+            return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        path = self._entry_path(request.url)
+        meta = self._load_meta(path)
+        if meta is not None:
+            if time.time() - meta['validated_at'] < meta.get('max_age', 0):
+                self._count('fresh')
+                return self._cached_response(request, path, meta, stream)
+            if meta.get('etag'):
+                request.headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request.headers['If-Modified-Since'] = meta['last_modified']
+
+        response = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        if response.status_code == 304 and meta is not None:
+            response.close()
+            os.utime(path)  # 재검증 시각 갱신
+            self._count('revalidated')
+            return self._cached_response(request, path, meta, stream)
+
+        control = _cache_control(response.headers)
+        cacheable = (
+            response.status_code == 200
+            and not control['no_store']
+            and (response.headers.get('ETag') or response.headers.get('Last-Modified') or control['max_age'] > 0)
+        )
+        if cacheable:
+            return self._store(request, response, path, control, stream)
+
+        self._count('miss')
+        return response
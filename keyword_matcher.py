@@ -0,0 +1,263 @@
+"""
+Keyword Matcher - 다중 키워드 매칭
+==================================
+키워드 목록을 트라이 구조의 정규식 하나로 컴파일하여, 텍스트를 한 번만
+훑으면서 포함된 모든 키워드(부분 문자열 기준)를 찾습니다.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 리터럴 패턴 판별용 정규식 메타 문자
+_REGEX_SPECIAL = re.compile(r'[\\^$.|?*+()\[\]{}]')
+
+# 배치 스캔 시 한 번에 n-gram 코드를 만드는 byte 수 (메모리 상한)
+SCAN_CHUNK_SIZE = 1 << 22
+
+
+def join_texts(texts: Sequence[str]) -> Tuple[bytes, np.ndarray]:
+    """텍스트들을 NUL로 이어붙인 소문자 UTF-8 bytes와 구분자 위치 배열 반환"""
+    joined = '\0'.join(texts)
+    if joined.count('\0') != max(len(texts) - 1, 0):
+        # 텍스트 안의 NUL은 행 경계와 섞이지 않게 공백으로 바꿈
+        joined = '\0'.join(text.replace('\0', ' ') for text in texts)
+    blob = joined.lower().encode('utf-8')
+    separators = np.flatnonzero(np.frombuffer(blob, dtype=np.uint8) == 0)
+    return blob, separators
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """키워드 목록을 공통 접두사를 공유하는 정규식으로 변환 (가장 긴 키워드 우선)"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True  # 키워드 끝 표시
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # 여기서 끝나는 키워드가 있으면 나머지는 선택적 (greedy → 가장 긴 키워드)
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """키워드 목록을 한 번 컴파일해두고 텍스트에 포함된 키워드를 찾는 매처
+
+    기존 `keyword in text` 반복과 같은 결과(부분 문자열, 대소문자 무시)를 내며,
+    키워드 수와 무관하게 텍스트를 한 번만 스캔합니다.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        self._index: Dict[str, int] = {}
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if keyword and keyword not in self._index:
+                self._index[keyword] = len(self.keywords)
+                self.keywords.append(keyword)
+
+        self._pattern = re.compile(_trie_pattern(self.keywords)) if self.keywords else None
+        # 같은 위치에서 시작하는 더 짧은 키워드 (예: 'meta' ⊂ 'metaverse')
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(keyword[:i] for i in range(1, len(keyword)) if keyword[:i] in self._index)
+            for keyword in self.keywords
+        }
+
+        # 배치 스캔용 UTF-8 키워드 (trigram 필터 테이블은 처음 사용할 때 생성)
+        self._encoded = [keyword.encode('utf-8') for keyword in self.keywords]
+        self._trigram_table = None
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """(시작 위치, 키워드)를 위치 순으로 yield (겹치는 매칭 포함, text는 소문자)"""
+        if self._pattern is None:
+            return
+        search = self._pattern.search
+        match = search(text)
+        while match:
+            start = match.start()
+            keyword = match.group()
+            for prefix in self._prefixes[keyword]:
+                yield start, prefix
+            yield start, keyword
+            match = search(text, start + 1)
+
+    def find_all(self, text: str) -> List[str]:
+        """텍스트에 포함된 키워드를 원래 키워드 목록 순서로 반환"""
+        found = {keyword for _, keyword in self.iter_matches(text.lower())}
+        return sorted(found, key=self._index.__getitem__)
+
+    def search(self, text: str) -> Optional[str]:
+        """텍스트에서 가장 먼저 나오는 키워드 (없으면 None)"""
+        if self._pattern is None:
+            return None
+        match = self._pattern.search(text.lower())
+        return match.group() if match else None
+
+
+    def _build_trigram_table(self) -> np.ndarray:
+        """키워드가 시작할 수 있는 3-byte 코드 표시 테이블"""
+        table = np.zeros(1 << 24, dtype=bool)
+        for data in self._encoded:
+            head = int.from_bytes(data[:3].ljust(3, b'\0'), 'big')
+            # 3 byte보다 짧은 키워드는 뒤따르는 모든 byte 조합을 표시
+            table[head:head + (1 << (8 * (3 - min(len(data), 3))))] = True
+        return table
+
+    def scan(self, blob: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """소문자 UTF-8 bytes에서 (시작 byte 위치, 키워드 id) 배열 반환 (겹치는 매칭 포함, 위치 순)
+
+        trigram 테이블로 후보 위치를 거른 뒤, 후보를 4-byte 코드로 정렬해 키워드별
+        구간만 NumPy로 byte 비교합니다 (매칭 하나하나에 대한 Python 루프 없음).
+        """
+        if not self.keywords or not blob:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        if self._trigram_table is None:
+            self._trigram_table = self._build_trigram_table()
+
+        data = np.frombuffer(blob + b'\0\0\0', dtype=np.uint8)
+        candidate_chunks = []
+        code_chunks = []
+        for chunk_start in range(0, len(blob), SCAN_CHUNK_SIZE):
+            window = data[chunk_start:chunk_start + SCAN_CHUNK_SIZE + 3].astype(np.uint32)
+            size = len(window) - 3
+            codes = (window[:size] << 16) | (window[1:size + 1] << 8) | window[2:size + 2]
+            hits = np.flatnonzero(self._trigram_table[codes])
+            candidate_chunks.append(hits + chunk_start)
+            code_chunks.append((codes[hits] << 8) | window[hits + 3])
+
+        candidates = np.concatenate(candidate_chunks)
+        codes = np.concatenate(code_chunks)
+        order = np.argsort(codes, kind='stable')
+        candidates, codes = candidates[order], codes[order]
+
+        position_parts = []
+        id_parts = []
+        for keyword_id, keyword in enumerate(self._encoded):
+            # 앞 4 byte(짧은 키워드는 가능한 모든 뒤 byte)가 같은 후보 구간
+            head_length = min(len(keyword), 4)
+            low = int.from_bytes(keyword[:head_length], 'big') << (8 * (4 - head_length))
+            begin, end = np.searchsorted(codes, [low, low + (1 << (8 * (4 - head_length)))])
+            positions = candidates[begin:end]
+            if len(keyword) > 4:
+                positions = positions[positions + len(keyword) <= len(blob)]
+            for offset in range(4, len(keyword)):
+                if not len(positions):
+                    break
+                positions = positions[data[positions + offset] == keyword[offset]]
+            if len(positions):
+                position_parts.append(positions)
+                id_parts.append(np.full(len(positions), keyword_id, dtype=np.int64))
+
+        if not position_parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        positions = np.concatenate(position_parts)
+        keyword_ids = np.concatenate(id_parts)
+        order = np.lexsort((keyword_ids, positions))
+        return positions[order], keyword_ids[order]
+
+    def match_texts(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """여러 텍스트를 한 번에 스캔하여 (행 번호, 키워드 id) 배열 반환 (행 순, 위치 순)"""
+        blob, separators = join_texts(texts)
+        positions, keyword_ids = self.scan(blob)
+        return np.searchsorted(separators, positions), keyword_ids
+
+
+class InsiderPatternDetector:
+    """제품 키워드와 'a.*b' 형태의 패턴을 한 번의 스캔으로 판별하는 검출기
+
+    패턴은 '.*'로 이어진 리터럴 순서로 해석하여, 같은 줄 안에서 리터럴이 차례로
+    나오는지를 매칭 위치만으로 확인합니다 (정규식 백트래킹 없음).
+    """
+
+    def __init__(self, keywords: Iterable[str], patterns: Iterable[str]):
+        self.keywords = [keyword.lower() for keyword in keywords]
+        self.patterns: List[Tuple[str, List[str]]] = []
+        for pattern in patterns:
+            literals = pattern.lower().split('.*')
+            if not all(literals) or any(_REGEX_SPECIAL.search(literal) for literal in literals):
+                raise ValueError(f"'리터럴.*리터럴' 형태의 패턴만 지원합니다: {pattern}")
+            self.patterns.append((pattern, literals))
+
+        self._keyword_set = set(self.keywords)
+        pattern_literals = [literal for _, literals in self.patterns for literal in literals]
+        self.matcher = KeywordMatcher(self.keywords + pattern_literals)
+
+    def _sequence_in_line(self, text: str, literals: List[str], hits: Dict[str, List[int]]) -> bool:
+        """literals가 같은 줄 안에서 순서대로 나오는지 (re.search('a.*b')와 동일)"""
+        for start in hits.get(literals[0], []):
+            line_end = text.find('\n', start)
+            if line_end == -1:
+                line_end = len(text)
+            position = start + len(literals[0])
+            for literal in literals[1:]:
+                positions = hits.get(literal, [])
+                i = bisect_left(positions, position)
+                if i == len(positions) or positions[i] >= line_end:
+                    break
+                position = positions[i] + len(literal)
+            else:
+                return True
+        return False
+
+    def detect(self, text: str) -> Optional[str]:
+        """매칭된 패턴(우선) 또는 가장 먼저 나온 제품 키워드 반환, 없으면 None"""
+        text = text.lower()
+        hits: Dict[str, List[int]] = {}
+        first_keyword = None
+        for start, word in self.matcher.iter_matches(text):
+            hits.setdefault(word, []).append(start)
+            if first_keyword is None and word in self._keyword_set:
+                first_keyword = word
+
+        for pattern, literals in self.patterns:
+            if self._sequence_in_line(text, literals, hits):
+                return pattern
+        return first_keyword
+
+    def detect_texts(self, texts: Sequence[str]) -> np.ndarray:
+        """detect()의 배치 버전: 텍스트별 판단 근거 배열 (없으면 None)"""
+        signals = np.full(len(texts), None, dtype=object)
+        if not len(texts):
+            return signals
+        blob, separators = join_texts(texts)
+        positions, keyword_ids = self.matcher.scan(blob)
+        rows = np.searchsorted(separators, positions)
+
+        # 패턴의 리터럴은 같은 줄(같은 행) 안에서만 이어짐
+        data = np.frombuffer(blob, dtype=np.uint8)
+        breaks = np.append(np.flatnonzero((data == 10) | (data == 0)), len(blob))
+
+        for pattern, literals in self.patterns:
+            literal_positions = [positions[keyword_ids == self.matcher._index[literal]] for literal in literals]
+            starts = literal_positions[0]
+            line_end = breaks[np.searchsorted(breaks, starts)]
+            end = starts + len(literals[0].encode('utf-8'))
+            ok = np.ones(len(starts), dtype=bool)
+            for literal, candidates in zip(literals[1:], literal_positions[1:]):
+                if len(candidates) == 0:
+                    ok[:] = False
+                    break
+                i = np.searchsorted(candidates, end)
+                found = i < len(candidates)
+                next_start = candidates[np.minimum(i, len(candidates) - 1)]
+                ok &= found & (next_start < line_end)
+                end = next_start + len(literal.encode('utf-8'))
+            matched_rows = np.unique(np.searchsorted(separators, starts[ok]))
+            signals[matched_rows[np.equal(signals[matched_rows], None)]] = pattern
+
+        # 패턴이 없으면 가장 먼저 나온 제품 키워드
+        keyword_mask = np.isin(keyword_ids, [self.matcher._index[keyword] for keyword in self.keywords])
+        keyword_rows, first = np.unique(rows[keyword_mask], return_index=True)
+        keyword_names = np.array(self.matcher.keywords, dtype=object)[keyword_ids[keyword_mask][first]]
+        unset = np.equal(signals[keyword_rows], None)
+        signals[keyword_rows[unset]] = keyword_names[unset]
+        return signals
@@ -0,0 +1,126 @@
+"""
+Polymarket CLOB - 호가/가격 보강
+================================
+필터링된 마켓의 모든 outcome 토큰 호가창을 CLOB 배치 엔드포인트(POST /books)로
+한꺼번에 가져와 최우선 호가, 중간가, 스프레드, 최우선 호가 잔량을 계산합니다.
+첫 번째 outcome(Yes) 요약은 정렬/표시용 컬럼(BOOK_COLUMNS)으로, outcome 전체 요약은
+OUTCOME_BOOKS_COLUMN(JSON)으로 붙입니다.
+공식 문서: https://docs.polymarket.com/developers/CLOB/prices-books/get-books
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import rate_limiter
+
+CLOB_API_URL = "https://clob.polymarket.com"
+BOOKS_BATCH_SIZE = 100   # POST /books 한 번에 조회하는 토큰 수
+CLOB_CONCURRENCY = 4     # 동시에 요청 중인 배치 수
+
+# 마켓(첫 번째 outcome = Yes 토큰) 기준으로 붙이는 컬럼
+BOOK_COLUMNS = ['best_bid', 'best_ask', 'midpoint', 'spread', 'bid_depth', 'ask_depth']
+# outcome별 요약 [{'token_id': ..., 'best_bid': ..., ...}, ...] (clobTokenIds 순서, JSON 문자열)
+OUTCOME_BOOKS_COLUMN = 'outcome_books'
+
+
+def parse_token_ids(value) -> List[str]:
+    """clobTokenIds 값(JSON 문자열 또는 리스트)을 토큰 id 리스트로 변환"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value) if value else []
+        except json.JSONDecodeError:
+            return []
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(token) for token in value if token]
+    return []
+
+
+def _best_level(levels, best) -> tuple:
+    """호가 목록에서 최우선 가격과 그 가격의 잔량 (없으면 NaN)"""
+    if not levels:
+        return np.nan, np.nan
+    prices = np.array([float(level['price']) for level in levels])
+    sizes = np.array([float(level['size']) for level in levels])
+    price = best(prices)
+    return price, sizes[prices == price].sum()
+
+
+def summarize_book(book: Dict) -> Dict:
+    """호가창 하나를 최우선 호가/중간가/스프레드/잔량으로 요약"""
+    best_bid, bid_depth = _best_level(book.get('bids'), np.max)
+    best_ask, ask_depth = _best_level(book.get('asks'), np.min)
+    return {
+        'best_bid': best_bid,
+        'best_ask': best_ask,
+        'midpoint': (best_bid + best_ask) / 2,
+        'spread': best_ask - best_bid,
+        'bid_depth': bid_depth,
+        'ask_depth': ask_depth,
+    }
+
+
+def _fetch_books_batch(session, token_ids: List[str]) -> List[Dict]:
+    rate_limiter.acquire('CLOB_GENERAL', 'CLOB_BOOKS')
+    response = session.post(f"{CLOB_API_URL}/books", json=[{'token_id': token} for token in token_ids], timeout=15)
+    response.raise_for_status()
+    books = response.json()
+    return books if isinstance(books, list) else []
+
+
+def fetch_book_summaries(session, token_ids: Iterable[str], batch_size: int = BOOKS_BATCH_SIZE,
+                         concurrency: int = CLOB_CONCURRENCY) -> Dict[str, Dict]:
+    """토큰별 호가 요약 {token_id: summary} (실패한 배치의 토큰은 빠짐)"""
+    unique_ids = list(dict.fromkeys(token for token in token_ids if token))
+    batches = [unique_ids[i:i + batch_size] for i in range(0, len(unique_ids), batch_size)]
+    summaries: Dict[str, Dict] = {}
+    if not batches:
+        return summaries
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(batches)))) as pool:
+        futures = {pool.submit(_fetch_books_batch, session, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            try:
+                books = future.result()
+            except Exception as e:
+                print(f"CLOB books fetch failed ({len(futures[future])} tokens): {e}")
+                continue
+            for book in books:
+                if isinstance(book, dict) and book.get('asset_id'):
+                    summaries[str(book['asset_id'])] = summarize_book(book)
+    return summaries
+
+
+def enrich_with_books(df: pd.DataFrame, session, token_column: str = 'clobTokenIds',
+                      summaries: Optional[Dict[str, Dict]] = None) -> pd.DataFrame:
+    """마켓 DataFrame에 Yes 토큰 호가 컬럼(BOOK_COLUMNS)과 outcome별 호가 요약(OUTCOME_BOOKS_COLUMN)을 붙여 반환"""
+    df = df.copy()
+    tokens = df[token_column] if token_column in df.columns else pd.Series([[]] * len(df), index=df.index)
+    token_lists = [parse_token_ids(value) for value in tokens]
+    if summaries is None:
+        # 모든 outcome 토큰을 같은 배치 요청으로 조회
+        summaries = fetch_book_summaries(session, (token for ids in token_lists for token in ids))
+
+    empty = dict.fromkeys(BOOK_COLUMNS, np.nan)
+    rows = [summaries.get(ids[0], empty) if ids else empty for ids in token_lists]
+    for column in BOOK_COLUMNS:
+        df[column] = np.array([row[column] for row in rows], dtype=float)
+    df[OUTCOME_BOOKS_COLUMN] = [_outcome_books_json(ids, summaries) for ids in token_lists]
+    return df
+
+
+def _outcome_books_json(token_ids: List[str], summaries: Dict[str, Dict]) -> Optional[str]:
+    """토큰별 호가 요약을 clobTokenIds 순서의 JSON 문자열로 (NaN은 null, 토큰이 없으면 None)"""
+    if not token_ids:
+        return None
+    books = []
+    for token in token_ids:
+        summary = summaries.get(token, {})
+        books.append({'token_id': token, **{
+            column: None if pd.isna(summary.get(column, np.nan)) else float(summary[column])
+            for column in BOOK_COLUMNS
+        }})
+    return json.dumps(books)
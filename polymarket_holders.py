@@ -0,0 +1,180 @@
+"""
+Polymarket Holders - 홀더 집중도 일괄 계산
+==========================================
+기업 관련 마켓들의 상위 홀더를 Data API(/holders)에서 동시에 가져와
+상위 N명 점유율과 허핀달 지수(HHI)를 NumPy로 한 번에 계산합니다.
+
+- Rate Limit: Data API General = 200 requests / 10초 (rate_limiter 공유 버킷)
+- 캐시: 마켓별 1분 TTL (app/lib/rateLimiter.ts의 getRecommendedCacheTTL('holders')와 동일)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import requests
+
+import rate_limiter
+
+DATA_API_URL = "https://data-api.polymarket.com"
+HOLDERS_LIMIT = 100        # 마켓(토큰)당 조회하는 상위 홀더 수
+HOLDERS_CACHE_TTL = 60     # 초
+HOLDERS_CONCURRENCY = 8    # 동시에 요청 중인 마켓 수
+TOP_N = 5
+
+CONCENTRATION_COLUMNS = ['conditionId', 'holder_count', 'total_amount', 'top1_share', 'top_n_share', 'hhi',
+                         'largest_holder']
+
+# 프로세스 전역 홀더 캐시 (conditionId → (조회 시각, 홀더 목록))
+_holders_cache: Dict[str, tuple] = {}
+_holders_cache_lock = threading.Lock()
+
+
+def _extract_holders(data) -> List[Dict]:
+    """/holders 응답에서 홀더 목록 추출 (토큰별 묶음은 하나로 합침)"""
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        return []
+    holders = []
+    for item in data:
+        if isinstance(item, dict) and isinstance(item.get('holders'), list):
+            holders.extend(item['holders'])
+        elif isinstance(item, dict):
+            holders.append(item)
+    return holders
+
+
+def fetch_holders(condition_id: str, session: Optional[requests.Session] = None,
+                  limit: int = HOLDERS_LIMIT) -> List[Dict]:
+    """마켓 하나의 상위 홀더 목록 (1분 TTL 캐시)"""
+    now = time.time()
+    with _holders_cache_lock:
+        cached = _holders_cache.get(condition_id)
+    if cached and now - cached[0] < HOLDERS_CACHE_TTL:
+        return cached[1]
+
+    rate_limiter.acquire('DATA_API_GENERAL')
+    response = (session or requests).get(f"{DATA_API_URL}/holders",
+                                         params={'market': condition_id, 'limit': limit}, timeout=15)
+    response.raise_for_status()
+    holders = _extract_holders(response.json())
+    with _holders_cache_lock:
+        _holders_cache[condition_id] = (time.time(), holders)
+    return holders
+
+
+def fetch_holders_bulk(condition_ids: Iterable[str], session: Optional[requests.Session] = None,
+                       concurrency: int = HOLDERS_CONCURRENCY) -> Dict[str, List[Dict]]:
+    """여러 마켓의 홀더를 동시에 조회 {conditionId: 홀더 목록} (실패한 마켓은 빠짐)"""
+    unique_ids = [condition_id for condition_id in dict.fromkeys(condition_ids) if condition_id]
+    results: Dict[str, List[Dict]] = {}
+    if not unique_ids:
+        return results
+
+    def fetch(condition_id: str):
+        try:
+            return fetch_holders(condition_id, session)
+        except Exception as e:
+            print(f"Holders fetch failed ({condition_id}): {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(unique_ids)))) as pool:
+        for condition_id, holders in zip(unique_ids, pool.map(fetch, unique_ids)):
+            if holders is not None:
+                results[condition_id] = holders
+    return results
+
+
+def concentration_metrics(holders_by_market: Dict[str, List[Dict]], top_n: int = TOP_N,
+                          outcome_index: Optional[int] = 0) -> pd.DataFrame:
+    """마켓별 홀더 집중도 (조회된 상위 홀더 기준 점유율, HHI는 0~1)
+
+    outcome_index=0이면 Yes 홀더만, None이면 모든 outcome 홀더를 합쳐 계산합니다.
+    """
+    condition_ids = list(holders_by_market)
+    market_ids, amounts, wallets = [], [], []
+    for market_id, condition_id in enumerate(condition_ids):
+        for holder in holders_by_market[condition_id]:
+            if outcome_index is not None and holder.get('outcomeIndex') != outcome_index:
+                continue
+            market_ids.append(market_id)
+            amounts.append(float(holder.get('amount') or 0))
+            wallets.append(holder.get('proxyWallet') or '')
+
+    market_count = len(condition_ids)
+    market_ids = np.asarray(market_ids, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=float)
+    wallets = np.asarray(wallets, dtype=object)
+
+    # 마켓 순, 보유량 내림차순 정렬 후 마켓 안에서의 순위 계산
+    order = np.lexsort((-amounts, market_ids))
+    market_ids, amounts, wallets = market_ids[order], amounts[order], wallets[order]
+    counts = np.bincount(market_ids, minlength=market_count)
+    group_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ranks = np.arange(len(market_ids)) - group_starts[market_ids]
+
+    totals = np.bincount(market_ids, weights=amounts, minlength=market_count)
+    safe_totals = np.where(totals > 0, totals, np.nan)
+    top1 = np.bincount(market_ids, weights=np.where(ranks == 0, amounts, 0), minlength=market_count)
+    top_n_amount = np.bincount(market_ids, weights=np.where(ranks < top_n, amounts, 0), minlength=market_count)
+    shares = amounts / safe_totals[market_ids] if len(amounts) else amounts
+    hhi = np.bincount(market_ids, weights=shares ** 2, minlength=market_count)
+
+    largest = np.full(market_count, '', dtype=object)
+    has_holders = counts > 0
+    largest[has_holders] = wallets[group_starts[has_holders]]
+
+    return pd.DataFrame({
+        'conditionId': condition_ids,
+        'holder_count': counts,
+        'total_amount': totals,
+        'top1_share': top1 / safe_totals,
+        'top_n_share': top_n_amount / safe_totals,
+        'hhi': np.where(has_holders, hhi, np.nan),
+        'largest_holder': largest,
+    }, columns=CONCENTRATION_COLUMNS)
+
+
+def add_holder_concentration(df: pd.DataFrame, session: Optional[requests.Session] = None,
+                             top_n: int = TOP_N, outcome_index: Optional[int] = 0) -> pd.DataFrame:
+    """마켓 DataFrame에 홀더 집중도 컬럼을 conditionId 기준으로 붙여 반환"""
+    if len(df) == 0 or 'conditionId' not in df.columns:
+        return df
+    holders = fetch_holders_bulk(df['conditionId'].tolist(), session)
+    metrics = concentration_metrics(holders, top_n=top_n, outcome_index=outcome_index)
+    return df.merge(metrics, on='conditionId', how='left')
+
+
+def main():
+    """정보 우위 가능성이 있는 저장 마켓 전체를 홀더 집중도로 스크리닝"""
+    from polymarket_store import MarketStore
+
+    df = MarketStore().query_markets(insider_only=True)
+    # HTML 폴백으로 수집된 마켓은 conditionId가 아니므로 제외
+    df = df[df['conditionId'].str.startswith('0x')]
+    if len(df) == 0:
+        print("⚠️  스크리닝할 마켓이 없습니다. polymarket_scraper.py를 먼저 실행하세요.")
+        return
+
+    print(f"👥 {len(df)}개 마켓 홀더 조회 중...")
+    start = time.time()
+    with requests.Session() as session:
+        result = add_holder_concentration(df, session)
+    print(f"✅ {time.time() - start:.1f}초 소요")
+
+    result = result.sort_values('hhi', ascending=False, na_position='last')
+    print(f"\n🎯 홀더 집중도 상위 마켓 (Yes 홀더, 상위 {TOP_N}명 점유율 / HHI):")
+    for _, row in result.head(20).iterrows():
+        if pd.isna(row['hhi']):
+            continue
+        print(f"\n  {row['title']}")
+        print(f"    상위 {TOP_N}명: {row['top_n_share']:.1%}  HHI: {row['hhi']:.3f}  홀더 수: {int(row['holder_count'])}")
+        print(f"    최대 홀더: {row['largest_holder']}")
+
+
+if __name__ == "__main__":
+    main()
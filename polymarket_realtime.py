@@ -0,0 +1,262 @@
+"""
+Polymarket Realtime - WebSocket 마켓 채널 구독
+==============================================
+추적 중인 기업 마켓의 outcome 토큰을 CLOB WebSocket 마켓 채널에 구독하고,
+호가/체결 이벤트를 메모리 상태(MarketState)에 반영합니다.
+대시보드와 API 핸들러는 새로고침(전체 수집) 없이 이 상태를 읽습니다.
+
+공식 문서: https://docs.polymarket.com/developers/CLOB/websocket/market-channel
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from polymarket_clob import BOOK_COLUMNS, parse_token_ids, summarize_book
+
+try:
+    import websockets  # 옵션: 실시간 가격 구독
+except ImportError:
+    websockets = None
+
+MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+PING_INTERVAL = 10       # 초 (서버가 텍스트 PING을 기대함)
+RECONNECT_DELAY = 1      # 재연결 대기 시작값 (초, 실패할 때마다 2배)
+MAX_RECONNECT_DELAY = 30
+
+# 상태에 저장하는 토큰별 필드
+STATE_COLUMNS = BOOK_COLUMNS + ['last_trade_price', 'updated_at']
+
+
+def _price(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class MarketState:
+    """토큰별 최신 호가/체결가 (스레드 안전, 갱신될 때마다 version 증가)"""
+
+    def __init__(self):
+        self._tokens: Dict[str, Dict] = {}
+        # 토큰별 가격 레벨 잔량 {'BUY': {가격: 잔량}, 'SELL': {...}} (book으로 채우고 price_change로 갱신)
+        self._levels: Dict[str, Dict[str, Dict[float, float]]] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def _update(self, token_id: str, values: Dict):
+        with self._lock:
+            entry = self._tokens.setdefault(token_id, dict.fromkeys(STATE_COLUMNS, np.nan))
+            entry.update(values)
+            best_bid, best_ask = entry['best_bid'], entry['best_ask']
+            entry['midpoint'] = (best_bid + best_ask) / 2
+            entry['spread'] = best_ask - best_bid
+            entry['updated_at'] = time.time()
+            self.version += 1
+
+    def _set_levels(self, token_id: str, bids, asks):
+        levels = {}
+        for side, entries in (('BUY', bids), ('SELL', asks)):
+            levels[side] = {float(level['price']): float(level['size']) for level in entries or []}
+        with self._lock:
+            self._levels[token_id] = levels
+
+    def _apply_level(self, token_id: str, side: str, price, size):
+        """가격 레벨 하나의 잔량 갱신 (0이면 레벨 삭제)"""
+        with self._lock:
+            levels = self._levels.get(token_id)
+            if levels is None or side not in levels:
+                return
+            price, size = float(price), float(size)
+            if size > 0:
+                levels[side][price] = size
+            else:
+                levels[side].pop(price, None)
+
+    def _level_size(self, token_id: str, side: str, price: float) -> float:
+        """해당 가격 레벨의 잔량 (호가창 스냅샷이 없거나 모르는 레벨이면 NaN)"""
+        with self._lock:
+            levels = self._levels.get(token_id)
+            if levels is None or np.isnan(price):
+                return np.nan
+            return levels[side].get(price, np.nan)
+
+    def get(self, token_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._tokens.get(token_id)
+            return dict(entry) if entry else None
+
+    def apply_event(self, event: Dict):
+        """마켓 채널 이벤트 하나를 상태에 반영"""
+        event_type = event.get('event_type')
+        if event_type == 'book':
+            # 이전 형식은 bids/asks 대신 buys/sells
+            bids = event.get('bids', event.get('buys'))
+            asks = event.get('asks', event.get('sells'))
+            summary = summarize_book({'bids': bids, 'asks': asks})
+            self._set_levels(str(event['asset_id']), bids, asks)
+            self._update(str(event['asset_id']), {key: summary[key] for key in BOOK_COLUMNS})
+        elif event_type == 'price_change':
+            # 변경된 가격 레벨마다 해당 토큰의 최우선 호가가 함께 옴
+            for change in event.get('price_changes') or []:
+                token_id = str(change['asset_id'])
+                if change.get('side') in ('BUY', 'SELL') and 'price' in change and 'size' in change:
+                    self._apply_level(token_id, change['side'], change['price'], change['size'])
+                if 'best_bid' in change or 'best_ask' in change:
+                    best_bid, best_ask = _price(change.get('best_bid')), _price(change.get('best_ask'))
+                    # 잔량은 새 최우선 가격 레벨 기준 (이전 레벨의 잔량을 남기지 않음)
+                    self._update(token_id, {
+                        'best_bid': best_bid,
+                        'best_ask': best_ask,
+                        'bid_depth': self._level_size(token_id, 'BUY', best_bid),
+                        'ask_depth': self._level_size(token_id, 'SELL', best_ask),
+                    })
+        elif event_type == 'last_trade_price':
+            self._update(str(event['asset_id']), {'last_trade_price': _price(event.get('price'))})
+
+    def apply_message(self, message: str):
+        """WebSocket 텍스트 메시지(이벤트 하나 또는 배열)를 상태에 반영"""
+        if message == 'PONG':
+            return
+        try:
+            data = json.loads(message)
+        except json.JSONDecodeError:
+            return
+        for event in data if isinstance(data, list) else [data]:
+            if isinstance(event, dict):
+                try:
+                    self.apply_event(event)
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+    def overlay(self, df: pd.DataFrame, token_column: str = 'clobTokenIds') -> pd.DataFrame:
+        """마켓 DataFrame의 호가 컬럼을 실시간 값(Yes 토큰)으로 덮어써 반환"""
+        if len(df) == 0 or token_column not in df.columns:
+            return df
+        yes_tokens = [ids[0] if ids else None for ids in map(parse_token_ids, df[token_column])]
+        with self._lock:
+            entries = [self._tokens.get(token) if token else None for token in yes_tokens]
+        if not any(entries):
+            return df
+        df = df.copy()
+        has_entry = np.array([entry is not None for entry in entries])
+        for column in BOOK_COLUMNS + ['last_trade_price']:
+            live = np.array([entry[column] if entry else np.nan for entry in entries], dtype=float)
+            current = df[column].to_numpy(dtype=float) if column in df.columns else np.full(len(df), np.nan)
+            df[column] = np.where(has_entry & ~np.isnan(live), live, current)
+        return df
+
+
+class MarketSubscriber:
+    """마켓 채널 구독기 (url은 테스트용 로컬 서버로 바꿀 수 있음)"""
+
+    def __init__(self, state: Optional[MarketState] = None, token_ids: Iterable[str] = (),
+                 url: str = MARKET_WS_URL, ping_interval: float = PING_INTERVAL):
+        if websockets is None:
+            raise ImportError("websockets is not installed")
+        self.state = state or MarketState()
+        self.url = url
+        self.ping_interval = ping_interval
+        self._token_ids: List[str] = list(dict.fromkeys(token_ids))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connection = None
+        self._stopped = False
+        self._resubscribe = False
+        self._thread: Optional[threading.Thread] = None
+
+    def set_tokens(self, token_ids: Iterable[str]):
+        """구독 토큰 변경 (바뀌었으면 다시 연결하여 새 목록으로 구독)"""
+        token_ids = list(dict.fromkeys(token for token in token_ids if token))
+        if set(token_ids) == set(self._token_ids):
+            return
+        self._token_ids = token_ids
+        self._resubscribe = True
+        self._close_connection()
+
+    def _close_connection(self):
+        if self._loop is not None and self._connection is not None:
+            asyncio.run_coroutine_threadsafe(self._connection.close(), self._loop)
+
+    async def _ping(self, connection):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await connection.send('PING')
+
+    async def _listen_once(self):
+        async with websockets.connect(self.url, ping_interval=None) as connection:
+            self._connection = connection
+            self._resubscribe = False
+            await connection.send(json.dumps({'assets_ids': self._token_ids, 'type': 'market'}))
+            ping_task = asyncio.create_task(self._ping(connection))
+            try:
+                async for message in connection:
+                    self.state.apply_message(message)
+            finally:
+                ping_task.cancel()
+                self._connection = None
+
+    async def run(self):
+        """stop()이 호출될 때까지 구독 (연결이 끊기면 지수 백오프로 재연결)"""
+        self._loop = asyncio.get_running_loop()
+        delay = RECONNECT_DELAY
+        while not self._stopped:
+            if not self._token_ids:
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            connected_at = time.monotonic()
+            try:
+                await self._listen_once()
+            except (OSError, websockets.exceptions.WebSocketException) as e:
+                if not self._stopped:
+                    print(f"WebSocket disconnected ({self.url}): {e}")
+            if self._stopped:
+                break
+            if self._resubscribe:
+                # 구독 목록 변경으로 끊은 경우 바로 재연결
+                self._resubscribe = False
+                delay = RECONNECT_DELAY
+                continue
+            # 한동안 잘 연결되어 있었으면 백오프 초기화
+            delay = RECONNECT_DELAY if time.monotonic() - connected_at > MAX_RECONNECT_DELAY else delay
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def stop(self):
+        self._stopped = True
+        self._close_connection()
+
+    def start_in_thread(self) -> threading.Thread:
+        """별도 스레드의 이벤트 루프에서 run() 실행 (Streamlit/동기 코드용)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=asyncio.run, args=(self.run(),), daemon=True,
+                                            name='polymarket-realtime')
+            self._thread.start()
+        return self._thread
+
+
+_subscriber: Optional[MarketSubscriber] = None
+_subscriber_lock = threading.Lock()
+
+
+def get_realtime_subscriber() -> MarketSubscriber:
+    """프로세스 전체에서 공유하는 구독기 (처음 사용할 때 백그라운드 스레드로 시작)"""
+    global _subscriber
+    with _subscriber_lock:
+        if _subscriber is None:
+            _subscriber = MarketSubscriber()
+        _subscriber.start_in_thread()
+        return _subscriber
+
+
+def yes_token_ids(df: pd.DataFrame, token_column: str = 'clobTokenIds') -> List[str]:
+    """마켓 DataFrame의 Yes 토큰 id 목록"""
+    if token_column not in df.columns:
+        return []
+    return [ids[0] for ids in map(parse_token_ids, df[token_column]) if ids]
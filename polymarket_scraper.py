@@ -4,14 +4,70 @@ Polymarket Scraper - 기업 관련 마켓 수집
 Polymarket에서 기업 관련 마켓을 수집하고 필터링합니다.
 """
 
+import argparse
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+import numpy as np
 import json
+import os
 import time
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 import re
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Optional, Iterator, NamedTuple, Tuple
+
+import rate_limiter
+from keyword_matcher import KeywordMatcher, InsiderPatternDetector
+from polymarket_store import MarketStore, market_key
+from http_cache import CachingHTTPAdapter
+from polymarket_clob import enrich_with_books, parse_token_ids
+from swr_cache import StaleWhileRevalidateCache
+from fingerprints import FingerprintSet, fingerprint
+
+try:
+    import ijson  # 옵션: 대용량 응답 스트리밍 파싱
+except ImportError:
+    ijson = None
+
+try:
+    from lxml import html as lxml_html  # 옵션: HTML 폴백 링크 추출 가속
+except ImportError:
+    lxml_html = None
+
+try:
+    import fcntl  # 옵션: 스냅샷 파일 프로세스 간 잠금 (POSIX)
+except ImportError:
+    fcntl = None
+
+GAMMA_API_URL = "https://gamma-api.polymarket.com"
+MARKETS_PAGE_SIZE = 500  # Gamma /markets 페이지당 마켓 수
+CRAWL_CONCURRENCY = 4    # 동시에 요청 중인 offset 페이지 수
+PAGE_FETCH_RETRIES = 2   # 실패한 offset 페이지 재시도 횟수
+PAGE_RETRY_DELAY = 1     # 재시도 대기 시작값 (초, 실패할 때마다 2배)
+REFRESH_INTERVAL = 300   # serve 모드 새로고침 간격 (초, getRecommendedCacheTTL('markets')와 동일)
+STALE_SNAPSHOT_AGE = 3 * REFRESH_INTERVAL  # 핸들러가 직접 다시 발행하는 스냅샷 나이 (초, 데몬 주기가 늘어져도 겹치지 않도록)
+REFRESH_CATEGORIES = [None]  # serve 모드 기본 수집 카테고리 (None = 전체, Tech 등은 마켓 태그로 구분)
+SCRAPE_CACHE_TTL = 60    # 같은 옵션의 수집 결과를 그대로 쓰는 시간 (초)
+SCRAPE_STALE_TTL = 300   # 그 뒤 이전 결과를 주면서 백그라운드로 갱신하는 시간 (초)
+
+# 로컬 캐시 디렉토리
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+TAG_INDEX_CACHE_FILE = os.path.join(CACHE_DIR, 'gamma_tags.json')
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, 'http')  # 조건부 GET 응답 본문 캐시
+TAGS_CACHE_TTL = 3600  # 태그는 거의 변하지 않음 (getRecommendedCacheTTL('tags')와 동일)
+
+# HTML 폴백: DOM 없이 JSON 스크립트 본문(__NEXT_DATA__ 포함)만 추출
+_JSON_SCRIPT_RE = re.compile(
+    r'<script\b[^>]*?\btype\s*=\s*["\']?application/json["\']?[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# 프로세스 전역 태그 인덱스 캐시 (label(소문자) → tag_id)
+_tag_index_cache = {'index': None, 'fetched_at': 0.0, 'resolved': {}}
+_tag_index_lock = threading.Lock()
 
 # 주요 기업 키워드 (확장 가능)
 COMPANY_KEYWORDS = [
@@ -40,6 +96,9 @@ COMPANY_KEYWORDS = [
     'walmart', 'target', 'costco', 'home depot', 'lowes',
 ]
 
+# 기업 키워드 매처 (import 시 한 번 컴파일)
+COMPANY_MATCHER = KeywordMatcher(COMPANY_KEYWORDS)
+
 # 제품 출시 관련 키워드
 PRODUCT_KEYWORDS = [
     'release', 'launch', 'announce', 'announcement', 'product', 'model', 'version',
@@ -62,15 +121,313 @@ INSIDER_INFO_PATTERNS = [
 ]
 
 
+# 제품 키워드 + 정보 우위 패턴 검출기 (import 시 한 번 컴파일)
+INSIDER_DETECTOR = InsiderPatternDetector(PRODUCT_KEYWORDS, INSIDER_INFO_PATTERNS)
+
+
+class IncompleteCrawlError(Exception):
+    """재시도 후에도 가져오지 못한 페이지가 있어 수집 결과가 완전하지 않음"""
+
+
+def is_complete_crawl(df: pd.DataFrame) -> bool:
+    """수집 결과가 API 전체 순회(또는 증분 스냅샷)로 얻은 완전한 목록인지
+    
+    Selenium/웹 스크래핑 폴백은 일부 마켓만 보이므로 완전하지 않은 것으로 봅니다.
+    """
+    return bool(df.attrs.get('complete', False))
+
+
+def _to_float(value) -> Optional[float]:
+    """숫자/숫자 문자열을 float로 (없거나 잘못된 값은 None, 스냅샷 비교를 위해 NaN 대신)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _PrefixedStream:
+    """앞부분을 미리 읽은 스트림 앞에 그 bytes를 다시 붙여 읽는 래퍼"""
+    
+    def __init__(self, prefix: bytes, stream):
+        self._prefix = prefix
+        self._stream = stream
+    
+    def read(self, size: int = -1) -> bytes:
+        if not self._prefix:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            data, self._prefix = self._prefix + self._stream.read(), b''
+        else:
+            data, self._prefix = self._prefix[:size], self._prefix[size:]
+        return data
+
+
+# filter_company_markets 결과 컬럼
+FILTERED_COLUMNS = [
+    'title', 'description', 'link', 'conditionId', 'slug', 'is_company_related',
+    'matched_companies', 'has_insider_potential', 'insider_signal', 'scraped_at',
+    'clobTokenIds', 'volume', 'liquidity', 'tags',
+]
+
+
+# outcome 목록은 마켓 대부분이 같으므로 같은 튜플을 공유 (JSON 문자열/리스트 → 튜플)
+DEFAULT_OUTCOMES = ('Yes', 'No')
+_outcomes_cache: Dict = {}
+
+
+def _intern_outcomes(value) -> Tuple[str, ...]:
+    """outcomes 값(JSON 문자열 또는 리스트)을 공유 튜플로 변환"""
+    if value is None:
+        return DEFAULT_OUTCOMES
+    key = value if isinstance(value, str) else tuple(value)
+    outcomes = _outcomes_cache.get(key)
+    if outcomes is None:
+        parsed = value
+        if isinstance(value, str):
+            try:
+                parsed = json.loads(value) if value else []
+            except json.JSONDecodeError:
+                parsed = [value]
+        outcomes = tuple(str(outcome) for outcome in parsed) if isinstance(parsed, (list, tuple)) else DEFAULT_OUTCOMES
+        outcomes = _outcomes_cache.setdefault(key, outcomes)
+    return outcomes
+
+
+# 태그 목록도 마켓끼리 겹치는 조합이 많으므로 같은 튜플을 공유 (태그 객체/문자열 → slug 튜플)
+_tags_cache: Dict = {}
+
+
+def _intern_tags(value) -> Tuple[str, ...]:
+    """tags 값(Gamma 태그 객체 리스트, slug 리스트 또는 ', '로 이은 문자열)을 공유 slug 튜플로 변환"""
+    if not isinstance(value, (str, list, tuple)) or not value:
+        return ()
+    if isinstance(value, str):
+        slugs = [slug for slug in value.split(', ') if slug]
+    else:
+        slugs = []
+        for tag in value:
+            if isinstance(tag, dict):
+                tag = tag.get('slug') or (tag.get('label') or '').lower()
+            if tag:
+                slugs.append(str(tag))
+    key = tuple(slugs)
+    return _tags_cache.setdefault(key, key)
+
+
+class Market(NamedTuple):
+    """정규화된 마켓 레코드 (인스턴스 dict 없는 튜플, market.get(key)로 기존 dict 코드와 호환)"""
+    title: str
+    description: str = ''
+    link: str = ''
+    conditionId: str = ''
+    id: str = ''
+    slug: str = ''
+    outcomes: Tuple[str, ...] = DEFAULT_OUTCOMES
+    closed: bool = False
+    updated_at: str = ''
+    clobTokenIds: Tuple[str, ...] = ()
+    volume: Optional[float] = None
+    liquidity: Optional[float] = None
+    scraped_at: str = ''
+    tags: Tuple[str, ...] = ()  # 태그 slug (예: 'tech'), 카테고리 뷰는 수집을 따로 하지 않고 이 값으로 거름
+    
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in _MARKET_FIELDS else default
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Market":
+        """dict(스냅샷 JSON 등)에서 레코드 생성 (모르는 키는 무시)"""
+        values = {key: data[key] for key in cls._fields if key in data}
+        values['outcomes'] = _intern_outcomes(data.get('outcomes'))
+        values['clobTokenIds'] = tuple(parse_token_ids(data.get('clobTokenIds')))
+        values['tags'] = _intern_tags(data.get('tags'))
+        return cls(**values)
+
+
+_MARKET_FIELDS = frozenset(Market._fields)
+
+
+def _first_text(batch: pd.DataFrame, columns: List[str]) -> pd.Series:
+    """여러 후보 컬럼 중 처음으로 비어 있지 않은 값 (market.get(a) or market.get(b)와 동일)"""
+    result = pd.Series('', index=batch.index, dtype=object)
+    for column in reversed(columns):
+        if column in batch.columns:
+            values = batch[column].fillna('').astype(str)
+            result = values.where(values != '', result)
+    return result
+
+
+def _report(progress: Optional[Callable[..., None]], **counts):
+    """진행 상황 콜백 호출 (stage, pages, markets, classified 키워드)"""
+    if progress is not None:
+        progress(**counts)
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    """ISO 8601 문자열을 timezone-aware datetime으로 변환 (실패 시 None)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+# 스냅샷 경로별 스레드 잠금 (fcntl 잠금은 프로세스 간, 이 잠금은 fcntl이 없을 때도 프로세스 안에서 직렬화)
+_snapshot_locks: Dict[str, threading.Lock] = {}
+_snapshot_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _snapshot_lock(path: str):
+    """스냅샷 파일의 load → sync → save 구간 잠금 (RefreshJob과 serve가 같은 파일을 동기화할 때)"""
+    with _snapshot_locks_guard:
+        lock = _snapshot_locks.setdefault(os.path.abspath(path), threading.Lock())
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(f"{path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class MarketSnapshot:
+    """conditionId 기준 로컬 마켓 스냅샷 (증분 동기화용)"""
+    
+    # 변경 여부 비교에서 제외할 필드
+    VOLATILE_FIELDS = ('scraped_at',)
+    # 스냅샷 파일 형식 (다르면 전체 동기화부터 다시, 3: 태그 포함)
+    FORMAT = 3
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.markets: Dict[str, Market] = {}
+        self.last_updated_at: Optional[str] = None  # 완료된 동기화까지 반영된 가장 최근 updatedAt (워터마크)
+        self.last_synced_at: Optional[str] = None
+        self._pending_updated_at: Optional[str] = None  # 진행 중인 동기화에서 본 가장 최근 updatedAt
+        self.complete = False  # 실패 없이 끝난 동기화가 확정(commit)된 스냅샷인지
+        # 확정된 (conditionId, updatedAt) 지문 → 증분 동기화에서 정규화 없이 건너뜀
+        self.fingerprints = FingerprintSet()
+    
+    @staticmethod
+    def _fingerprints_path(path: str) -> str:
+        return f"{path}.fingerprints.npy"
+    
+    def _rebuild_fingerprints(self):
+        self.fingerprints = FingerprintSet(
+            fingerprint(condition_id, market.updated_at) for condition_id, market in self.markets.items()
+        )
+    
+    @classmethod
+    def load(cls, path: str) -> "MarketSnapshot":
+        """디스크에서 스냅샷 읽기 (없으면 빈 스냅샷)"""
+        snapshot = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            snapshot.markets = {
+                condition_id: Market.from_dict(market) for condition_id, market in data.get('markets', {}).items()
+            }
+            snapshot.last_updated_at = data.get('last_updated_at')
+            snapshot.last_synced_at = data.get('last_synced_at')
+            # 이전 형식(complete 표시 없음)은 미완료로 보고 전체 동기화
+            snapshot.complete = bool(data.get('complete')) and data.get('format') == cls.FORMAT
+        except (OSError, ValueError):
+            pass
+        # 지문 파일이 없거나 손상되었으면 마켓에서 다시 계산
+        fingerprints = FingerprintSet.load(cls._fingerprints_path(path))
+        if snapshot.complete and fingerprints is not None and len(fingerprints) == len(snapshot.markets):
+            snapshot.fingerprints = fingerprints
+        else:
+            snapshot._rebuild_fingerprints()
+        return snapshot
+    
+    def save(self, path: Optional[str] = None):
+        """스냅샷을 디스크에 저장 (임시 파일 후 교체)"""
+        path = path or self.path
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # 프로세스/스레드별 임시 파일 (http_cache와 같은 규칙)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format': self.FORMAT,
+                'complete': self.complete,
+                'last_updated_at': self.last_updated_at,
+                'last_synced_at': self.last_synced_at,
+                'markets': {condition_id: market._asdict() for condition_id, market in self.markets.items()},
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.fingerprints.save(self._fingerprints_path(path))
+    
+    def _advance_watermark(self, updated_at: str):
+        # 워터마크 후보만 올림 (commit 전에 동기화가 실패하면 다음 동기화가 같은 구간을 다시 가져옴)
+        parsed = _parse_timestamp(updated_at)
+        current = _parse_timestamp(self._pending_updated_at or self.last_updated_at)
+        if parsed and (current is None or parsed > current):
+            self._pending_updated_at = updated_at
+    
+    def commit(self):
+        """실패한 페이지 없이 끝난 동기화의 워터마크와 지문 확정"""
+        if self._pending_updated_at:
+            self.last_updated_at = self._pending_updated_at
+        self._pending_updated_at = None
+        # 수정/종료된 마켓의 이전 지문은 버리고 현재 마켓 기준으로 다시 만듦
+        self._rebuild_fingerprints()
+        self.complete = True
+    
+    def _is_changed(self, old: Market, new: Market) -> bool:
+        volatile = dict.fromkeys(self.VOLATILE_FIELDS)
+        return old._replace(**volatile) != new._replace(**volatile)
+    
+    def apply(self, markets: List[Market]) -> Dict[str, List[str]]:
+        """마켓 변경분 반영, {'inserted', 'updated', 'closed'} conditionId 목록 반환"""
+        diff = {'inserted': [], 'updated': [], 'closed': []}
+        for market in markets:
+            condition_id = market.get('conditionId')
+            if not condition_id:
+                continue
+            self._advance_watermark(market.get('updated_at', ''))
+            
+            existing = self.markets.get(condition_id)
+            if market.get('closed'):
+                if existing is not None:
+                    del self.markets[condition_id]
+                    diff['closed'].append(condition_id)
+            elif existing is None:
+                self.markets[condition_id] = market
+                diff['inserted'].append(condition_id)
+            elif self._is_changed(existing, market):
+                self.markets[condition_id] = market
+                diff['updated'].append(condition_id)
+        return diff
+
+
 class PolymarketScraper:
-    def __init__(self):
+    def __init__(self, tag_cache_path: Optional[str] = TAG_INDEX_CACHE_FILE,
+                 http_cache_dir: Optional[str] = HTTP_CACHE_DIR):
+        self.tag_cache_path = tag_cache_path  # None이면 디스크에 저장하지 않음
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
         })
+        # 변경 없는 응답은 304 재검증으로 로컬 본문 재사용 (None이면 캐시 안 함)
+        if http_cache_dir:
+            try:
+                self.session.mount('https://', CachingHTTPAdapter(http_cache_dir))
+            except OSError as e:
+                print(f"HTTP cache disabled ({http_cache_dir}): {e}")
         self.base_url = "https://polymarket.com"
+        self.last_crawl_complete = False  # 마지막 iter_market_pages가 API 전체 순회를 마쳤는지
         
     def fetch_markets_page(self, page: int = 1, category: Optional[str] = None) -> Optional[str]:
         """Polymarket 마켓 페이지 가져오기"""
@@ -83,6 +440,7 @@ class PolymarketScraper:
             if page > 1:
                 params['page'] = page
             
+            rate_limiter.acquire('POLYMARKET_WEB')
             response = self.session.get(url, params=params, timeout=15)
             response.raise_for_status()
             return response.text
@@ -90,168 +448,393 @@ class PolymarketScraper:
             print(f"Error fetching page {page}: {e}")
             return None
     
-    def parse_markets_from_html(self, html: str) -> List[Dict]:
+    def parse_markets_from_html(self, html: str) -> List[Market]:
         """HTML에서 마켓 정보 파싱"""
         markets = []
-        soup = BeautifulSoup(html, 'html.parser')
+        scraped_at = datetime.now().isoformat()
         
         # Polymarket은 React 기반이므로, JSON-LD나 data 속성에서 정보 추출 시도
-        # 1. JSON-LD 스크립트 태그에서 데이터 추출
-        scripts = soup.find_all('script', type='application/json')
-        for script in scripts:
+        # 1. JSON 스크립트 태그에서 데이터 추출 (전체 DOM을 만들지 않고 정규식으로 본문만)
+        for script_body in _JSON_SCRIPT_RE.findall(html):
             try:
-                data = json.loads(script.string)
-                # 중첩된 구조에서 마켓 정보 찾기
-                if isinstance(data, dict):
-                    # 다양한 가능한 키 확인
-                    for key in ['events', 'markets', 'data', 'items']:
-                        if key in data and isinstance(data[key], list):
-                            for item in data[key]:
-                                if isinstance(item, dict):
-                                    title = item.get('title') or item.get('question') or item.get('name', '')
-                                    if title:
-                                        slug = item.get('slug', '') or item.get('id', '')
-                                        link = item.get('url', '')
-                                        if not link and slug:
-                                            link = f"{self.base_url}/event/{slug}"
-                                        markets.append({
-                                            'title': title,
-                                            'description': item.get('description', ''),
-                                            'link': link,
-                                            'scraped_at': datetime.now().isoformat()
-                                        })
-            except (json.JSONDecodeError, AttributeError):
+                data = json.loads(script_body)
+            except json.JSONDecodeError:
                 continue
+            # 중첩된 구조에서 마켓 정보 찾기
+            if isinstance(data, dict):
+                # 다양한 가능한 키 확인
+                for key in ['events', 'markets', 'data', 'items']:
+                    if key in data and isinstance(data[key], list):
+                        for item in data[key]:
+                            if isinstance(item, dict):
+                                title = item.get('title') or item.get('question') or item.get('name', '')
+                                if title:
+                                    slug = item.get('slug', '') or item.get('id', '')
+                                    link = item.get('url', '')
+                                    if not link and slug:
+                                        link = f"{self.base_url}/event/{slug}"
+                                    markets.append(Market(
+                                        title=title,
+                                        description=item.get('description', '') or '',
+                                        link=link,
+                                        scraped_at=scraped_at,
+                                    ))
         
         # 2. 일반적인 HTML 구조에서 추출 (폴백)
         if not markets:
             # 링크가 /event/로 시작하는 모든 링크 찾기
-            event_links = soup.find_all('a', href=re.compile(r'/event/'))
-            seen_titles = set()
+            seen_links = set()
             
-            for link_elem in event_links:
-                try:
-                    href = link_elem.get('href', '')
-                    title = link_elem.get_text(strip=True)
-                    
-                    # 중복 제거
-                    if title and title not in seen_titles:
-                        seen_titles.add(title)
-                        full_link = self.base_url + href if not href.startswith('http') else href
-                        
-                        markets.append({
-                            'title': title,
-                            'description': '',
-                            'link': full_link,
-                            'scraped_at': datetime.now().isoformat()
-                        })
-                except Exception:
-                    continue
+            for href, title in self._iter_event_links(html):
+                full_link = self.base_url + href if not href.startswith('http') else href
+                # 중복 제거 (같은 마켓을 가리키는 링크 기준, 제목이 같은 다른 마켓은 유지)
+                if title and full_link not in seen_links:
+                    seen_links.add(full_link)
+                    markets.append(Market(title=title, link=full_link, scraped_at=scraped_at))
         
         return markets
     
-    def get_category_tag_id(self, category_name: str = "tech") -> Optional[str]:
-        """카테고리 이름으로 tag_id 찾기"""
+    def _iter_event_links(self, html: str) -> Iterator[tuple]:
+        """href에 /event/가 들어간 링크의 (href, 텍스트) yield (lxml이 있으면 C 파서 사용)"""
+        if lxml_html is not None and html.strip():
+            try:
+                root = lxml_html.fromstring(html)
+            except (ValueError, lxml_html.etree.ParserError):
+                root = None
+            if root is not None:
+                for link_elem in root.iter('a'):
+                    href = link_elem.get('href', '')
+                    if '/event/' in href:
+                        # BeautifulSoup get_text(strip=True)와 동일하게 조각별 strip 후 연결
+                        yield href, ''.join(text.strip() for text in link_elem.itertext())
+                return
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        for link_elem in soup.find_all('a', href=re.compile(r'/event/')):
+            yield link_elem.get('href', ''), link_elem.get_text(strip=True)
+    
+    def _fetch_tags(self) -> List[Dict]:
+        """Gamma /tags 전체 목록 가져오기"""
+        tags_url = f"{GAMMA_API_URL}/tags"
+        rate_limiter.acquire('GAMMA_GENERAL', 'GAMMA_TAGS')
+        response = self.session.get(tags_url, timeout=15)
+        response.raise_for_status()
+        
+        tags = response.json()
+        if isinstance(tags, dict):
+            # 응답이 dict인 경우
+            tags = tags.get('data', [])
+        return [tag for tag in tags if isinstance(tag, dict)] if isinstance(tags, list) else []
+    
+    def _load_tag_index_file(self) -> tuple[Optional[Dict[str, str]], float]:
+        """디스크에 저장된 태그 인덱스 읽기"""
+        if not self.tag_cache_path:
+            return None, 0.0
         try:
-            tags_url = "https://gamma-api.polymarket.com/tags"
-            response = self.session.get(tags_url, timeout=15)
+            with open(self.tag_cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            return cached['index'], float(cached['fetched_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, 0.0
+    
+    def _save_tag_index_file(self, index: Dict[str, str], fetched_at: float):
+        """태그 인덱스를 디스크에 저장 (임시 파일 후 교체)"""
+        if not self.tag_cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.tag_cache_path) or '.', exist_ok=True)
+            tmp_path = f"{self.tag_cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'fetched_at': fetched_at, 'index': index}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.tag_cache_path)
+        except OSError as e:
+            print(f"Error saving tag cache: {e}")
+    
+    def get_tag_index(self) -> Dict[str, str]:
+        """label(소문자) → tag_id 인덱스 반환 (메모리/디스크 캐시, TTL: TAGS_CACHE_TTL)"""
+        with _tag_index_lock:
+            now = time.time()
+            if _tag_index_cache['index'] is not None and now - _tag_index_cache['fetched_at'] < TAGS_CACHE_TTL:
+                return _tag_index_cache['index']
             
-            if response.status_code == 200:
-                tags = response.json()
-                if isinstance(tags, list):
-                    for tag in tags:
-                        if isinstance(tag, dict):
-                            label = tag.get('label', '').lower()
-                            if category_name.lower() in label or label in category_name.lower():
-                                return tag.get('id')
-                elif isinstance(tags, dict):
-                    # 응답이 dict인 경우
-                    if 'data' in tags:
-                        for tag in tags['data']:
-                            label = tag.get('label', '').lower()
-                            if category_name.lower() in label or label in category_name.lower():
-                                return tag.get('id')
-        except Exception as e:
-            print(f"Error fetching tags: {e}")
+            index, fetched_at = self._load_tag_index_file()
+            if index is None or now - fetched_at >= TAGS_CACHE_TTL:
+                try:
+                    tags = self._fetch_tags()
+                except Exception as e:
+                    print(f"Error fetching tags: {e}")
+                    # 갱신 실패 시 만료된 인덱스라도 사용 (다음 호출에서 다시 시도)
+                    return _tag_index_cache['index'] or index or {}
+                
+                index = {}
+                for tag in tags:
+                    label = (tag.get('label') or '').lower()
+                    if label and tag.get('id') is not None and label not in index:
+                        index[label] = tag.get('id')
+                fetched_at = now
+                self._save_tag_index_file(index, fetched_at)
+            
+            _tag_index_cache.update({'index': index, 'fetched_at': fetched_at, 'resolved': {}})
+            return index
+    
+    def get_category_tag_id(self, category_name: str = "tech") -> Optional[str]:
+        """카테고리 이름으로 tag_id 찾기 (정확히 일치하는 label 우선, 없으면 부분 일치)"""
+        index = self.get_tag_index()
+        name = category_name.lower()
         
-        return None
+        resolved = _tag_index_cache['resolved']
+        if name in resolved:
+            return resolved[name]
+        
+        tag_id = index.get(name)
+        if tag_id is None:
+            for label, candidate_id in index.items():
+                if name in label or label in name:
+                    tag_id = candidate_id
+                    break
+        
+        if index:
+            resolved[name] = tag_id
+        return tag_id
     
-    def fetch_markets_api(self, limit: int = 100, category: Optional[str] = None) -> List[Dict]:
-        """Polymarket API를 통해 마켓 데이터 가져오기"""
+    def _extract_market_list(self, data) -> List[Dict]:
+        """API 응답에서 마켓 리스트 추출"""
         markets = []
+        # API 응답 구조에 맞게 파싱
+        if isinstance(data, list):
+            markets = data
+        elif isinstance(data, dict):
+            if 'data' in data:
+                markets = data['data']
+            elif 'events' in data:
+                markets = data['events']
+            elif 'markets' in data:
+                markets = data['markets']
+            
+            # markets 리스트 안에 data가 있는 경우
+            if markets and len(markets) > 0 and isinstance(markets[0], dict) and 'data' in markets[0]:
+                markets = markets[0]['data']
+        return markets
+    
+    def _normalize_market(self, market, scraped_at: Optional[str] = None) -> Optional[Market]:
+        """API 마켓 데이터 정규화 (title이 없으면 None)"""
+        if not isinstance(market, dict):
+            return None
         
-        # 카테고리 필터링을 위한 tag_id 가져오기
-        tag_id = None
-        if category:
-            tag_id = self.get_category_tag_id(category)
-            if tag_id:
-                print(f"✅ '{category}' 카테고리 tag_id: {tag_id}")
-            else:
-                print(f"⚠️  '{category}' 카테고리 tag_id를 찾지 못했습니다. 전체 마켓을 가져옵니다.")
+        # Polymarket API 응답 구조에 맞게 정규화
+        title = market.get('question') or market.get('title') or market.get('name', '')
+        if not title:
+            return None
+        
+        slug = market.get('slug', '') or market.get('id', '')
+        link = market.get('url', '')
+        if not link and slug:
+            link = f"{self.base_url}/event/{slug}"
+        
+        # conditionId 추출
+        condition_id = market.get('conditionId') or market.get('condition_id') or market.get('id') or ''
+        if not condition_id and slug:
+            condition_id = slug
+        
+        return Market(
+            title=title,
+            description=market.get('description', '') or '',
+            link=link,
+            conditionId=condition_id,
+            id=market.get('id') or slug or condition_id,
+            slug=slug,
+            outcomes=_intern_outcomes(market.get('outcomes')),
+            closed=market.get('closed', False),
+            updated_at=market.get('updatedAt', ''),
+            clobTokenIds=tuple(parse_token_ids(market.get('clobTokenIds'))),
+            volume=_to_float(market.get('volumeNum', market.get('volume'))),
+            liquidity=_to_float(market.get('liquidityNum', market.get('liquidity'))),
+            scraped_at=scraped_at or datetime.now().isoformat(),
+            tags=_intern_tags(market.get('tags')),
+        )
+    
+    def _iter_response_markets(self, response) -> Iterator[Dict]:
+        """응답 본문의 마켓 객체를 하나씩 yield (ijson이 있으면 배열을 스트리밍 파싱)"""
+        if ijson is None:
+            yield from self._extract_market_list(response.json())
+            return
+        
+        raw = response.raw
+        raw.decode_content = True
+        # 최상위가 배열인지 확인할 때까지 앞부분만 읽음
+        prefix = b''
+        while not prefix.strip():
+            chunk = raw.read(1024)
+            if not chunk:
+                return
+            prefix += chunk
+        stream = _PrefixedStream(prefix, raw)
+        
+        if prefix.lstrip()[:1] == b'[':
+            yield from ijson.items(stream, 'item', use_float=True)
+        else:
+            # dict 형태 응답은 구조가 다양하므로 전체 파싱
+            yield from self._extract_market_list(json.loads(stream.read()))
+    
+    def _fetch_markets_page_api(self, offset: int, page_size: int, tag_id: Optional[str] = None,
+                                extra_params: Optional[Dict] = None) -> Iterator[Dict]:
+        """Gamma /markets 한 페이지의 원본 마켓을 도착하는 대로 하나씩 yield (HTTP 오류 시 예외)"""
+        params = {
+            'closed': 'false',
+            'limit': page_size,
+            'offset': offset,
+            'include_tag': 'true',  # 마켓별 태그 → 전체 수집 한 번으로 Tech 등 카테고리 뷰 구성
+        }
+        if tag_id:
+            params['tag_id'] = tag_id
+        if extra_params:
+            params.update(extra_params)
+            # 값이 None인 필터는 제거 (예: closed 필터 해제)
+            params = {key: value for key, value in params.items() if value is not None}
+        
+        rate_limiter.acquire('GAMMA_GENERAL', 'GAMMA_MARKETS')
+        with self.session.get(f"{GAMMA_API_URL}/markets", params=params, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            yield from self._iter_response_markets(response)
+    
+    def _resolve_tag_id(self, category: Optional[str]) -> Optional[str]:
+        """카테고리 필터링을 위한 tag_id 가져오기"""
+        if not category:
+            return None
+        tag_id = self.get_category_tag_id(category)
+        if tag_id:
+            print(f"✅ '{category}' 카테고리 tag_id: {tag_id}")
+        else:
+            print(f"⚠️  '{category}' 카테고리 tag_id를 찾지 못했습니다. 전체 마켓을 가져옵니다.")
+        return tag_id
+    
+    def _fetch_normalized_page(self, offset: int, page_size: int, tag_id: Optional[str] = None,
+                               extra_params: Optional[Dict] = None,
+                               known: Optional[FingerprintSet] = None) -> tuple[Optional[int], List[Market], int]:
+        """한 페이지를 가져와 (원본 마켓 수, 정규화된 마켓 리스트, 건너뛴 마켓 수) 반환
+        
+        실패하면 PAGE_FETCH_RETRIES번까지 다시 시도하고, 그래도 실패하면 원본 마켓 수는 None입니다.
+        known이 주어지면 (conditionId, updatedAt) 지문이 이미 있는 마켓은 정규화하지 않고 건너뜁니다.
+        """
+        for attempt in range(PAGE_FETCH_RETRIES + 1):
+            raw_count = 0
+            skipped = 0
+            page = []
+            scraped_at = datetime.now().isoformat()  # 페이지 단위로 한 번만 계산
+            try:
+                # 원본 마켓은 정규화 후 바로 버림 → 메모리는 페이지 크기에 비례
+                for market in self._fetch_markets_page_api(offset, page_size, tag_id, extra_params):
+                    raw_count += 1
+                    if known is not None and isinstance(market, dict) and \
+                            fingerprint(market.get('conditionId'), market.get('updatedAt', '')) in known:
+                        skipped += 1
+                        continue
+                    normalized = self._normalize_market(market, scraped_at)
+                    if normalized:
+                        page.append(normalized)
+                return raw_count, page, skipped
+            except Exception as e:
+                print(f"API fetch failed (offset {offset}, attempt {attempt + 1}/{PAGE_FETCH_RETRIES + 1}): {e}")
+                if attempt < PAGE_FETCH_RETRIES:
+                    time.sleep(PAGE_RETRY_DELAY * 2 ** attempt)
+        return None, [], 0
+    
+    def iter_markets_api(self, category: Optional[str] = None, page_size: int = MARKETS_PAGE_SIZE,
+                         concurrency: int = 1) -> Iterator[List[Market]]:
+        """Gamma API의 열린 마켓 전체를 offset 페이지 단위로 순회 (정규화된 페이지를 yield)
+        
+        짧은 페이지(page_size 미만)가 오면 마지막 페이지로 보고 종료합니다.
+        concurrency > 1이면 그만큼의 offset 페이지를 동시에 요청합니다 (완료 순서대로 yield).
+        재시도 후에도 실패한 페이지가 있으면 IncompleteCrawlError를 일으킵니다
+        (이미 yield한 페이지만으로는 목록 중간이 비어 있을 수 있음).
+        """
+        tag_id = self._resolve_tag_id(category)
+        if concurrency > 1:
+            yield from self._iter_markets_api_concurrent(tag_id, page_size, concurrency)
+            return
+        
+        offset = 0
+        while True:
+            raw_count, page, _ = self._fetch_normalized_page(offset, page_size, tag_id)
+            if raw_count is None:
+                raise IncompleteCrawlError(f"offset {offset} 페이지를 가져오지 못했습니다")
+            if page:
+                yield page
+            if raw_count < page_size:
+                return
+            offset += page_size
+    
+    def _iter_markets_api_concurrent(self, tag_id: Optional[str], page_size: int, concurrency: int) -> Iterator[List[Market]]:
+        """offset 페이지를 concurrency개씩 동시에 요청하며 순회
+        
+        마지막 페이지 뒤까지 미리 요청한 offset은 실패해도 무시하고, 마지막 페이지보다
+        앞의 offset이 실패했을 때만 IncompleteCrawlError를 일으킵니다.
+        """
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+        pending = {}
+        next_offset = 0
+        end_offset = None  # 짧은 페이지 중 가장 작은 offset
+        failed_offsets = []  # 재시도 후에도 실패한 offset (마지막 페이지가 정해질 때까지 보류)
+        
+        def missing_offsets():
+            return [offset for offset in failed_offsets if end_offset is None or offset < end_offset]
+        
+        def submit_next():
+            nonlocal next_offset
+            future = pool.submit(self._fetch_normalized_page, next_offset, page_size, tag_id)
+            pending[future] = next_offset
+            next_offset += page_size
         
-        # Polymarket Markets API 시도
         try:
-            markets_url = "https://gamma-api.polymarket.com/markets"
-            params = {
-                'closed': 'false',
-                'limit': limit,
-                'offset': 0
-            }
+            for _ in range(concurrency):
+                submit_next()
             
-            if tag_id:
-                params['tag_id'] = tag_id
-            
-            response = self.session.get(markets_url, params=params, timeout=15)
-            
-            if response.status_code == 200:
-                data = response.json()
-                # API 응답 구조에 맞게 파싱
-                if isinstance(data, list):
-                    markets = data
-                elif isinstance(data, dict):
-                    if 'data' in data:
-                        markets = data['data']
-                    elif 'events' in data:
-                        markets = data['events']
-                    elif 'markets' in data:
-                        markets = data['markets']
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    offset = pending.pop(future)
+                    raw_count, page, _ = future.result()
+                    if raw_count is None:
+                        # 마지막 페이지 뒤의 offset일 수 있으므로 끝을 알 때까지 판단 보류 (다음 요청은 하지 않음)
+                        failed_offsets.append(offset)
+                    else:
+                        if raw_count < page_size:
+                            end_offset = offset if end_offset is None else min(end_offset, offset)
+                        
+                        # 마지막 페이지 이후의 offset은 버림
+                        if page and (end_offset is None or offset <= end_offset):
+                            yield page
+                        
+                        if end_offset is None:
+                            submit_next()
                     
-                    # markets 리스트 안에 data가 있는 경우
-                    if markets and len(markets) > 0 and isinstance(markets[0], dict) and 'data' in markets[0]:
-                        markets = markets[0]['data']
-                
-                # 마켓 데이터 정규화
-                normalized_markets = []
-                for market in markets:
-                    if isinstance(market, dict):
-                        # Polymarket API 응답 구조에 맞게 정규화
-                        title = market.get('question') or market.get('title') or market.get('name', '')
-                        if title:
-                            slug = market.get('slug', '') or market.get('id', '')
-                            link = market.get('url', '')
-                            if not link and slug:
-                                link = f"{self.base_url}/event/{slug}"
-                            
-                            # conditionId 추출
-                            condition_id = market.get('conditionId') or market.get('condition_id') or market.get('id') or ''
-                            if not condition_id and slug:
-                                condition_id = slug
-                            
-                            normalized_markets.append({
-                                'title': title,
-                                'question': title,  # API와 일관성 유지
-                                'description': market.get('description', ''),
-                                'link': link,
-                                'conditionId': condition_id,
-                                'id': market.get('id') or slug or condition_id,
-                                'slug': slug,
-                                'outcomes': market.get('outcomes', ['Yes', 'No']),
-                                'closed': market.get('closed', False),
-                                'scraped_at': datetime.now().isoformat()
-                            })
-                markets = normalized_markets
-        except Exception as e:
-            print(f"API fetch failed: {e}")
+                    if end_offset is not None and missing_offsets():
+                        break
+                if end_offset is not None and missing_offsets():
+                    break
+            
+            missing = missing_offsets()
+            if missing:
+                raise IncompleteCrawlError(f"offset {min(missing)} 페이지를 가져오지 못했습니다")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def fetch_markets_api(self, limit: Optional[int] = None, category: Optional[str] = None) -> List[Market]:
+        """Polymarket API를 통해 마켓 데이터 가져오기 (limit이 None이면 전체)"""
+        markets = []
+        
+        # Polymarket Markets API 시도
+        page_size = min(limit, MARKETS_PAGE_SIZE) if limit else MARKETS_PAGE_SIZE
+        try:
+            for page in self.iter_markets_api(category=category, page_size=page_size):
+                markets.extend(page)
+                if limit and len(markets) >= limit:
+                    markets = markets[:limit]
+                    break
+        except IncompleteCrawlError:
+            # 일부만 가져온 목록은 돌려주지 않음 (하나도 못 가져왔으면 웹 스크래핑 폴백)
+            if markets:
+                raise
         
         # API 실패 시 웹 스크래핑으로 폴백
         if not markets:
@@ -266,159 +849,443 @@ class PolymarketScraper:
     
     def is_company_related(self, title: str, description: str = "") -> tuple[bool, List[str]]:
         """마켓이 기업 관련인지 확인"""
-        text = (title + " " + description).lower()
-        matched_companies = []
-        
-        for company in COMPANY_KEYWORDS:
-            if company.lower() in text:
-                matched_companies.append(company)
-        
+        matched_companies = COMPANY_MATCHER.find_all(title + " " + description)
         return len(matched_companies) > 0, matched_companies
     
+    def insider_signal(self, title: str, description: str = "") -> Optional[str]:
+        """내부 정보 우위 판단 근거 (매칭된 패턴 또는 제품 키워드), 없으면 None"""
+        return INSIDER_DETECTOR.detect(title + " " + description)
+    
     def has_insider_info_potential(self, title: str, description: str = "") -> bool:
         """내부 정보 우위가 있을 수 있는 마켓인지 확인"""
-        text = (title + " " + description).lower()
+        return self.insider_signal(title, description) is not None
+    
+    def filter_company_markets(self, markets) -> pd.DataFrame:
+        """기업 관련 마켓 필터링 (Market/dict 리스트 또는 DataFrame 배치)"""
+        batch = markets if isinstance(markets, pd.DataFrame) else pd.DataFrame(list(markets))
+        if len(batch) == 0:
+            return pd.DataFrame(columns=FILTERED_COLUMNS)
+        
+        # 다양한 필드명에서 title 가져오기
+        title = _first_text(batch, ['title', 'question', 'name'])
+        description = _first_text(batch, ['description', 'desc'])
+        texts = np.asarray(title + " " + description, dtype=object)
+        
+        # 배치 전체를 한 번에 스캔 → (행, 키워드) 쌍을 행 순/키워드 목록 순으로 정렬
+        rows, keyword_ids = COMPANY_MATCHER.match_texts(texts.tolist())
+        if len(rows) == 0:
+            return pd.DataFrame(columns=FILTERED_COLUMNS)
+        keyword_count = len(COMPANY_MATCHER.keywords)
+        pairs = np.unique(rows * keyword_count + keyword_ids)
+        pair_rows = pairs // keyword_count
+        company_rows, group_starts = np.unique(pair_rows, return_index=True)
+        # 행별 기업명을 ', '로 이어붙임 (그룹 마지막 항목 뒤에는 구분자 없음)
+        separators = np.full(len(pairs), ', ', dtype=object)
+        separators[np.append(group_starts[1:], len(pairs)) - 1] = ''
+        parts = np.asarray(COMPANY_MATCHER.keywords, dtype=object)[pairs % keyword_count] + separators
+        companies = np.add.reduceat(parts, group_starts)
         
-        # 제품 출시 관련 키워드 확인
-        has_product_keyword = any(keyword in text for keyword in PRODUCT_KEYWORDS)
+        # 정보 우위 판단은 기업 관련 마켓에 대해서만
+        signals = INSIDER_DETECTOR.detect_texts(texts[company_rows].tolist())
         
-        # 패턴 매칭
-        has_pattern = any(re.search(pattern, text, re.I) for pattern in INSIDER_INFO_PATTERNS)
+        def column(name: str, default=''):
+            if name in batch.columns:
+                return batch[name].to_numpy()[company_rows]
+            return default
         
-        return has_product_keyword or has_pattern
+        scraped_at = batch['scraped_at'].fillna(datetime.now().isoformat()) if 'scraped_at' in batch.columns else None
+        # 표준화된 필드명으로 저장
+        return pd.DataFrame({
+            'title': title.to_numpy()[company_rows],
+            'description': description.to_numpy()[company_rows],
+            'link': _first_text(batch, ['link', 'url']).to_numpy()[company_rows],
+            'conditionId': column('conditionId'),
+            'slug': column('slug'),
+            'is_company_related': True,
+            'matched_companies': companies,
+            'has_insider_potential': ~np.equal(signals, None),
+            'insider_signal': np.where(np.equal(signals, None), '', signals),
+            'scraped_at': scraped_at.to_numpy()[company_rows] if scraped_at is not None else datetime.now().isoformat(),
+            'clobTokenIds': column('clobTokenIds', None),
+            'volume': np.asarray(column('volume', np.nan), dtype=float),
+            'liquidity': np.asarray(column('liquidity', np.nan), dtype=float),
+            'tags': [', '.join(_intern_tags(tags)) for tags in column('tags', [()] * len(company_rows))],
+        }, columns=FILTERED_COLUMNS)
+    
+    def enrich_markets(self, df: pd.DataFrame) -> pd.DataFrame:
+        """필터링된 마켓에 CLOB 호가 컬럼(최우선 호가, 중간가, 스프레드, 잔량) 추가"""
+        if len(df) == 0:
+            return df
+        print(f"💹 CLOB 호가 조회 중 ({len(df)}개 마켓)...")
+        return enrich_with_books(df, self.session)
+    
+    def _category_url(self, category: Optional[str] = None) -> str:
+        url = f"{self.base_url}/markets"
+        if category:
+            url += f"?category={category}"
+        return url
     
-    def filter_company_markets(self, markets: List[Dict]) -> pd.DataFrame:
-        """기업 관련 마켓 필터링"""
-        filtered = []
+    def _iter_selenium_pages(self, categories: List[Optional[str]]) -> Iterator[List[Market]]:
+        """재사용 브라우저로 카테고리 페이지들을 탭에서 동시에 렌더링하여 마켓 페이지 yield"""
+        from browser_pool import get_browser_pool
         
-        for market in markets:
-            # 다양한 필드명에서 title 가져오기
-            title = market.get('title', '') or market.get('question', '') or market.get('name', '')
-            description = market.get('description', '') or market.get('desc', '')
-            
-            is_company, companies = self.is_company_related(title, description)
-            has_insider_potential = self.has_insider_info_potential(title, description)
-            
-            if is_company:
-                # 표준화된 필드명으로 저장
-                filtered_market = {
-                    'title': title,
-                    'description': description,
-                    'link': market.get('link', '') or market.get('url', ''),
-                    'is_company_related': True,
-                    'matched_companies': ', '.join(companies),
-                    'has_insider_potential': has_insider_potential,
-                    'scraped_at': market.get('scraped_at', datetime.now().isoformat())
-                }
-                filtered.append(filtered_market)
-        
-        return pd.DataFrame(filtered)
-    
-    def scrape_all_markets(self, max_pages: int = 10, use_selenium: bool = False, category: Optional[str] = None) -> pd.DataFrame:
-        """모든 마켓 수집 및 필터링"""
-        category_text = f" ({category} 카테고리)" if category else ""
-        print(f"🔍 Polymarket 마켓 수집 중{category_text}...")
-        all_markets = []
+        print("🌐 Selenium을 사용하여 동적 콘텐츠 로드 중...")
+        urls = [self._category_url(category) for category in categories]
+        pages = get_browser_pool().render_pages(urls)
+        
+        for url in urls:
+            html = pages.get(url)
+            if not html:
+                continue
+            markets = self.parse_markets_from_html(html)
+            print(f"✅ Selenium을 통해 {len(markets)}개 마켓 수집 ({url})")
+            if markets:
+                yield markets
+    
+    def iter_market_pages(self, max_pages: int = 10, use_selenium: bool = False, category: Optional[str] = None,
+                          concurrency: int = CRAWL_CONCURRENCY) -> Iterator[List[Market]]:
+        """수집 소스(Selenium → API → 웹 스크래핑) 순서로 마켓 페이지 yield
+        
+        API 전체 순회를 끝까지 마친 경우에만 self.last_crawl_complete가 True가 됩니다.
+        API가 페이지를 일부 yield한 뒤 실패하면 IncompleteCrawlError를 그대로 전달합니다.
+        """
+        self.last_crawl_complete = False
         
         # Selenium 사용 옵션
         if use_selenium:
             try:
-                from selenium import webdriver
-                from selenium.webdriver.common.by import By
-                from selenium.webdriver.support.ui import WebDriverWait
-                from selenium.webdriver.support import expected_conditions as EC
-                
-                print("🌐 Selenium을 사용하여 동적 콘텐츠 로드 중...")
-                options = webdriver.ChromeOptions()
-                options.add_argument('--headless')
-                options.add_argument('--no-sandbox')
-                options.add_argument('--disable-dev-shm-usage')
-                
-                driver = webdriver.Chrome(options=options)
-                url = f"{self.base_url}/markets"
-                if category:
-                    url += f"?category={category}"
-                driver.get(url)
-                
-                # 페이지 로드 대기
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                
-                # 스크롤하여 더 많은 콘텐츠 로드
-                for i in range(3):
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
-                
-                html = driver.page_source
-                driver.quit()
-                
-                markets = self.parse_markets_from_html(html)
-                all_markets.extend(markets)
-                print(f"✅ Selenium을 통해 {len(markets)}개 마켓 수집")
+                selenium_count = 0
+                for markets in self._iter_selenium_pages([category]):
+                    selenium_count += len(markets)
+                    yield markets
+                if selenium_count > 0:
+                    return
             except ImportError:
                 print("⚠️  Selenium이 설치되지 않았습니다. 일반 스크래핑으로 진행합니다.")
-                use_selenium = False
             except Exception as e:
                 print(f"⚠️  Selenium 오류: {e}. 일반 스크래핑으로 진행합니다.")
-                use_selenium = False
         
         # API 방식 시도 (Selenium 미사용 또는 실패 시)
-        if not use_selenium or len(all_markets) == 0:
-            markets = self.fetch_markets_api(limit=500, category=category)
-            if markets:
-                all_markets.extend(markets)
-                print(f"✅ API를 통해 {len(markets)}개 마켓 수집")
-            else:
-                # 웹 스크래핑 방식
-                for page in range(1, max_pages + 1):
-                    html = self.fetch_markets_page(page=page, category=category)
-                    if html:
-                        markets = self.parse_markets_from_html(html)
-                        if not markets:
-                            break
-                        all_markets.extend(markets)
-                        print(f"📄 페이지 {page}: {len(markets)}개 마켓 수집")
-                        time.sleep(1)  # Rate limiting
-                    else:
+        api_count = 0
+        try:
+            for markets in self.iter_markets_api(category=category, concurrency=concurrency):
+                api_count += len(markets)
+                print(f"📄 API offset 페이지: {len(markets)}개 마켓 수집 (누적 {api_count}개)")
+                yield markets
+        except IncompleteCrawlError as e:
+            if api_count > 0:
+                raise
+            print(f"⚠️  API 수집 실패 ({e}). 웹 스크래핑으로 진행합니다.")
+        if api_count > 0:
+            print(f"✅ API를 통해 {api_count}개 마켓 수집")
+            self.last_crawl_complete = True
+            return
+        
+        # 웹 스크래핑 방식
+        for page in range(1, max_pages + 1):
+            html = self.fetch_markets_page(page=page, category=category)
+            if not html:
+                break
+            markets = self.parse_markets_from_html(html)
+            if not markets:
+                break
+            print(f"📄 페이지 {page}: {len(markets)}개 마켓 수집")
+            yield markets
+    
+    def _snapshot_path(self, category: Optional[str] = None) -> str:
+        """카테고리별 기본 스냅샷 파일 경로"""
+        return os.path.join(CACHE_DIR, f"markets_{category or 'all'}.json")
+    
+    def sync_markets(self, snapshot: MarketSnapshot, category: Optional[str] = None,
+                     page_size: int = MARKETS_PAGE_SIZE,
+                     progress: Optional[Callable[..., None]] = None) -> Dict[str, List[str]]:
+        """스냅샷을 최신 상태로 증분 동기화하고 변경분(diff) 반환
+        
+        첫 동기화는 열린 마켓 전체를 가져오고, 이후에는 updatedAt 내림차순으로
+        마지막 동기화 이후 변경된 마켓만 가져와 추가/수정/종료를 반영합니다.
+        재시도 후에도 실패한 페이지가 있으면 워터마크를 확정하지 않고 IncompleteCrawlError를
+        일으킵니다 (호출자는 스냅샷을 저장하지 말아야 함).
+        """
+        diff = {'inserted': [], 'updated': [], 'closed': []}
+        
+        def merge(page_diff):
+            for key in diff:
+                diff[key].extend(page_diff[key])
+        
+        pages = markets = 0
+        watermark = _parse_timestamp(snapshot.last_updated_at)
+        if watermark is None or not snapshot.markets or not snapshot.complete:
+            # 전체 동기화 (첫 동기화, 또는 이전 동기화가 확정되지 않은 스냅샷)
+            seen_ids = set()
+            for page in self.iter_markets_api(category=category, page_size=page_size, concurrency=CRAWL_CONCURRENCY):
+                seen_ids.update(market.conditionId for market in page)
+                merge(snapshot.apply(page))
+                pages, markets = pages + 1, markets + len(page)
+                _report(progress, stage='fetch', pages=pages, markets=markets)
+            # 전체 목록에 없는 기존 마켓(그 사이 종료됨)은 제거
+            for condition_id in [condition_id for condition_id in snapshot.markets if condition_id not in seen_ids]:
+                del snapshot.markets[condition_id]
+                diff['closed'].append(condition_id)
+        else:
+            tag_id = self._resolve_tag_id(category)
+            # closed 필터를 해제해야 종료된 마켓도 변경분으로 받을 수 있음
+            extra_params = {'order': 'updatedAt', 'ascending': 'false', 'closed': None}
+            # 지문은 확정된 동기화 기준일 때만 워터마크 도달 판단에 사용 (아니면 updatedAt 비교만)
+            known = snapshot.fingerprints if snapshot.complete else None
+            offset = 0
+            while True:
+                raw_count, page, skipped = self._fetch_normalized_page(offset, page_size, tag_id, extra_params,
+                                                                       known=known)
+                if raw_count is None:
+                    raise IncompleteCrawlError(f"offset {offset} 변경분 페이지를 가져오지 못했습니다")
+                changed = []
+                # 확정된 (conditionId, updatedAt)이 나왔으면 그 뒤는 모두 워터마크 이전
+                reached_watermark = skipped > 0
+                for market in page:
+                    updated_at = _parse_timestamp(market.get('updated_at'))
+                    if updated_at is not None and updated_at < watermark:
+                        reached_watermark = True
                         break
+                    changed.append(market)
+                merge(snapshot.apply(changed))
+                pages, markets = pages + 1, markets + len(changed)
+                _report(progress, stage='fetch', pages=pages, markets=markets)
+                
+                if reached_watermark or raw_count < page_size:
+                    break
+                offset += page_size
+        
+        snapshot.commit()
+        snapshot.last_synced_at = datetime.now().isoformat()
+        print(f"🔄 증분 동기화: 추가 {len(diff['inserted'])}개, 수정 {len(diff['updated'])}개, 종료 {len(diff['closed'])}개")
+        return diff
+    
+    def scrape_all_markets(self, max_pages: int = 10, use_selenium: bool = False, category: Optional[str] = None,
+                           concurrency: int = CRAWL_CONCURRENCY, incremental: bool = False,
+                           snapshot_path: Optional[str] = None, enrich: bool = False,
+                           progress: Optional[Callable[..., None]] = None) -> pd.DataFrame:
+        """모든 마켓 수집 및 필터링 (페이지 단위로 중복 제거 및 필터링)
+        
+        incremental=True이면 로컬 스냅샷을 증분 동기화하고, 이번 동기화에서
+        새로 추가된 마켓을 is_new 컬럼으로 표시합니다.
+        enrich=True이면 결과에 CLOB 호가 컬럼을 붙입니다.
+        progress가 주어지면 페이지마다 progress(stage=, pages=, markets=, classified=)로
+        진행 상황을 알립니다 (stage: 'fetch' → 'classify' → 'enrich').
+        """
+        category_text = f" ({category} 카테고리)" if category else ""
+        print(f"🔍 Polymarket 마켓 수집 중{category_text}...")
+        
+        if incremental and not use_selenium:
+            df = self._scrape_incremental(category, snapshot_path or self._snapshot_path(category), progress)
+            complete = True
+        else:
+            df = self._scrape_pages(max_pages, use_selenium, category, concurrency, progress)
+            complete = self.last_crawl_complete
+        
+        if enrich:
+            _report(progress, stage='enrich', classified=len(df))
+            df = self.enrich_markets(df)
+        # 완전한 목록인지 표시 (is_complete_crawl, 저장소 발행 시 빠진 마켓 정리 여부)
+        df.attrs['complete'] = complete
+        return df
+    
+    def _scrape_pages(self, max_pages: int, use_selenium: bool, category: Optional[str], concurrency: int,
+                      progress: Optional[Callable[..., None]] = None) -> pd.DataFrame:
+        """페이지 단위로 전체 수집 후 중복 제거 및 필터링"""
+        seen = FingerprintSet()
+        pages = 0
+        unique_count = 0
+        classified_count = 0
+        filtered_frames = []
         
-        # 중복 제거
-        seen_titles = set()
-        unique_markets = []
-        for market in all_markets:
-            title = market.get('title', '') or market.get('question', '')
-            if title and title not in seen_titles:
-                seen_titles.add(title)
-                unique_markets.append(market)
+        for markets in self.iter_market_pages(max_pages=max_pages, use_selenium=use_selenium, category=category,
+                                              concurrency=concurrency):
+            # 중복 제거 (페이지가 도착하는 대로 conditionId/slug/link 지문 기준)
+            unique_markets = []
+            for market in markets:
+                key = market_key(market)
+                if key and seen.add(fingerprint(key)):
+                    unique_markets.append(market)
+            unique_count += len(unique_markets)
+            
+            # 기업 관련 마켓 필터링 (원본 페이지는 필터링 후 버림)
+            page_df = self.filter_company_markets(unique_markets)
+            if len(page_df) > 0:
+                filtered_frames.append(page_df)
+            pages += 1
+            classified_count += len(page_df)
+            _report(progress, stage='fetch', pages=pages, markets=unique_count, classified=classified_count)
         
-        print(f"\n📊 총 {len(unique_markets)}개 고유 마켓 수집 완료")
+        print(f"\n📊 총 {unique_count}개 고유 마켓 수집 완료")
         
-        # 기업 관련 마켓 필터링
-        print("\n🔍 기업 관련 마켓 필터링 중...")
-        df = self.filter_company_markets(unique_markets)
+        df = pd.concat(filtered_frames, ignore_index=True) if filtered_frames else pd.DataFrame()
         
         print(f"✅ {len(df)}개 기업 관련 마켓 발견")
         if len(df) > 0 and 'has_insider_potential' in df.columns:
             print(f"   - 내부 정보 우위 가능성: {df['has_insider_potential'].sum()}개")
+        return df
+    
+    def _scrape_incremental(self, category: Optional[str], snapshot_path: str,
+                            progress: Optional[Callable[..., None]] = None) -> pd.DataFrame:
+        """스냅샷 증분 동기화 후 기업 관련 마켓 필터링"""
+        # 다른 작업이 같은 스냅샷을 동기화하는 중이면 끝날 때까지 기다렸다가 그 결과부터 이어서 동기화
+        with _snapshot_lock(snapshot_path):
+            snapshot = MarketSnapshot.load(snapshot_path)
+            is_first_sync = not snapshot.markets
+            # 동기화가 실패하면(IncompleteCrawlError 등) 저장하지 않고 그대로 전달 → 디스크 스냅샷은 이전 상태
+            diff = self.sync_markets(snapshot, category=category, progress=progress)
+            try:
+                snapshot.save()
+            except OSError as e:
+                print(f"Error saving market snapshot: {e}")
+        
+        print(f"\n📊 스냅샷 {len(snapshot.markets)}개 마켓")
+        _report(progress, stage='classify', markets=len(snapshot.markets))
+        df = self.filter_company_markets(list(snapshot.markets.values()))
+        _report(progress, stage='classify', classified=len(df))
+        if len(df) > 0:
+            new_ids = set() if is_first_sync else set(diff['inserted'])
+            df['is_new'] = df['conditionId'].isin(new_ids)
         
+        print(f"✅ {len(df)}개 기업 관련 마켓 발견")
+        if len(df) > 0:
+            print(f"   - 내부 정보 우위 가능성: {df['has_insider_potential'].sum()}개")
+            print(f"   - 지난 새로고침 이후 신규: {df['is_new'].sum()}개")
         return df
     
-    def scrape_tech_markets(self, max_pages: int = 10, use_selenium: bool = False) -> pd.DataFrame:
+    def scrape_tech_markets(self, max_pages: int = 10, use_selenium: bool = False, incremental: bool = False,
+                            enrich: bool = False) -> pd.DataFrame:
         """Tech 카테고리 마켓만 수집"""
-        return self.scrape_all_markets(max_pages=max_pages, use_selenium=use_selenium, category="tech")
+        return self.scrape_all_markets(max_pages=max_pages, use_selenium=use_selenium, category="tech",
+                                       incremental=incremental, enrich=enrich)
+
+
+# 프로세스 전역 수집 결과 캐시 ((카테고리, 옵션) → DataFrame)
+_scrape_cache = StaleWhileRevalidateCache(SCRAPE_CACHE_TTL, SCRAPE_STALE_TTL, name='scrape')
+
+
+def scrape_markets_cached(max_pages: int = 10, use_selenium: bool = False, category: Optional[str] = None,
+                          incremental: bool = False, enrich: bool = False) -> pd.DataFrame:
+    """scrape_all_markets 결과를 카테고리/옵션별로 캐시하여 반환 (결과 DataFrame은 공유되므로 수정하지 말 것)
+    
+    같은 키로 동시에 호출하면 수집 한 번을 함께 기다리고, TTL이 지난 결과는
+    즉시 반환하면서 백그라운드에서 한 번만 다시 수집합니다.
+    """
+    key = (category, max_pages, use_selenium, incremental, enrich)
+    return _scrape_cache.get(key, lambda: PolymarketScraper().scrape_all_markets(
+        max_pages=max_pages, use_selenium=use_selenium, category=category, incremental=incremental, enrich=enrich))
+
+
+# 캐시 키별로 마지막으로 발행한 수집 결과 (같은 DataFrame을 다시 발행하지 않도록)
+_published_frames: Dict[tuple, pd.DataFrame] = {}
+_published_lock = threading.Lock()
+
+
+def _snapshot_age(snapshot: Dict) -> float:
+    """발행 후 지난 시간 (초, refreshed_at을 읽을 수 없으면 무한대)"""
+    try:
+        return (datetime.now() - datetime.fromisoformat(snapshot['refreshed_at'])).total_seconds()
+    except (KeyError, TypeError, ValueError):
+        return float('inf')
+
+
+def refresh_snapshot_if_stale(store: MarketStore, category: Optional[str] = None,
+                              max_age: float = STALE_SNAPSHOT_AGE, max_pages: int = 10,
+                              use_selenium: bool = False) -> Optional[Dict]:
+    """스냅샷이 없거나 max_age초보다 오래되었으면 수집 캐시를 거쳐 다시 발행하고 스냅샷 정보 반환
+    
+    새로고침 데몬이 없거나 멈춘 환경(서버리스 핸들러)용입니다. 데몬이 돌고 있으면 max_age
+    (기본: 새로고침 간격의 3배) 안에 새 스냅샷이 발행되므로 핸들러는 읽기만 합니다.
+    다시 발행할 때는 데몬과 같은 옵션(증분 동기화 + CLOB 호가)으로 수집하여 데몬이 채운
+    호가/신규 표시 컬럼을 비우지 않습니다. 수집이 실패하거나 빈 결과면 기존 스냅샷을
+    그대로 반환합니다 (없으면 None).
+    """
+    snapshot = store.snapshot_info(category)
+    if snapshot is not None and _snapshot_age(snapshot) < max_age:
+        return snapshot
+    
+    key = (category, max_pages, use_selenium)
+    started = time.monotonic()
+    try:
+        df = scrape_markets_cached(max_pages=max_pages, use_selenium=use_selenium, category=category,
+                                   incremental=True, enrich=True)
+    except Exception as e:
+        print(f"Refresh failed ({category or 'all'}): {e}. 이전 스냅샷을 유지합니다.")
+        return snapshot
+    with _published_lock:
+        # 오래된 캐시 결과를 즉시 돌려받은 경우 등 이미 발행한 DataFrame이면 건너뜀
+        if len(df) == 0 or _published_frames.get(key) is df:
+            return snapshot
+        _published_frames[key] = df
+    store.publish_snapshot(df, category=category, duration_sec=time.monotonic() - started,
+                           complete=is_complete_crawl(df))
+    return store.snapshot_info(category)
 
 
-def main():
-    """메인 실행 함수"""
+def serve(interval: int = REFRESH_INTERVAL, categories: Optional[List[Optional[str]]] = None,
+          enrich: bool = True, once: bool = False):
+    """interval초마다 카테고리별 마켓을 새로 수집하여 저장소에 스냅샷으로 발행
+    
+    대시보드와 API 핸들러는 저장소의 스냅샷만 읽으므로, 조회 수와 무관하게
+    업스트림 요청은 이 프로세스에서만 발생합니다.
+    """
+    categories = categories or REFRESH_CATEGORIES
+    store = MarketStore()
+    scraper = PolymarketScraper()
+    print(f"🕒 새로고침 데몬 시작: {', '.join(category or 'all' for category in categories)} / {interval}초 간격")
+    
+    while True:
+        cycle_started = time.monotonic()
+        for category in categories:
+            started = time.monotonic()
+            try:
+                df = scraper.scrape_all_markets(category=category, incremental=True, enrich=enrich)
+            except Exception as e:
+                # 일부 페이지 실패(IncompleteCrawlError) 포함 → 빠진 마켓이 있는 목록은 발행하지 않음
+                print(f"Refresh failed ({category or 'all'}): {e}. 이전 스냅샷을 유지합니다.")
+                continue
+            if len(df) == 0:
+                # 수집 실패로 빈 결과면 이전 스냅샷 유지
+                print(f"⚠️  {category or 'all'}: 수집 결과가 없어 이전 스냅샷을 유지합니다.")
+                continue
+            version = store.publish_snapshot(df, category=category, duration_sec=time.monotonic() - started,
+                                             complete=is_complete_crawl(df))
+            print(f"📦 스냅샷 발행: {category or 'all'} v{version} ({len(df)}개 마켓)")
+        
+        if once:
+            return
+        time.sleep(max(0.0, interval - (time.monotonic() - cycle_started)))
+
+
+def main(argv: Optional[List[str]] = None):
+    """메인 실행 함수 (serve: 주기적 새로고침 데몬)"""
+    parser = argparse.ArgumentParser(description="Polymarket 기업 관련 마켓 수집")
+    subparsers = parser.add_subparsers(dest='command')
+    serve_parser = subparsers.add_parser('serve', help="주기적으로 수집하여 저장소에 스냅샷 발행")
+    serve_parser.add_argument('--interval', type=int, default=REFRESH_INTERVAL, help="새로고침 간격 (초)")
+    serve_parser.add_argument('--category', action='append', dest='categories',
+                              help="수집 카테고리 (여러 번 지정 가능, 'all'은 전체)")
+    serve_parser.add_argument('--no-enrich', action='store_true', help="CLOB 호가 조회 생략")
+    serve_parser.add_argument('--once', action='store_true', help="한 번만 새로고침하고 종료")
+    args = parser.parse_args(argv)
+    
+    if args.command == 'serve':
+        categories = [None if category == 'all' else category for category in args.categories or []]
+        try:
+            serve(interval=args.interval, categories=categories or None, enrich=not args.no_enrich, once=args.once)
+        except KeyboardInterrupt:
+            print("\n👋 새로고침 데몬 종료")
+        return
+    
     scraper = PolymarketScraper()
-    df = scraper.scrape_all_markets(max_pages=5)
+    started = time.monotonic()
+    df = scraper.scrape_all_markets(max_pages=5, enrich=True)
     
     if len(df) > 0:
-        # 결과 저장
-        output_file = "polymarket_company_markets.csv"
-        df.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"\n💾 결과 저장: {output_file}")
+        # 결과를 스냅샷으로 발행 (버전이 올라가 실행 중인 대시보드도 다시 읽고, 완전한 수집이면 종료된 마켓 정리)
+        store = MarketStore()
+        version = store.publish_snapshot(df, duration_sec=time.monotonic() - started, complete=is_complete_crawl(df))
+        print(f"\n💾 결과 저장: {store.path} (스냅샷 v{version}, {len(df)}개 마켓)")
         
         # 내부 정보 우위 가능성이 높은 마켓만 출력
         insider_markets = df[df['has_insider_potential'] == True]
@@ -427,6 +1294,8 @@ def main():
             for idx, row in insider_markets.iterrows():
                 print(f"\n  {row['title']}")
                 print(f"    기업: {row['matched_companies']}")
+                if pd.notna(row.get('midpoint')):
+                    print(f"    가격: {row['midpoint']:.3f} (스프레드 {row['spread']:.3f})")
                 print(f"    링크: {row.get('link', 'N/A')}")
     else:
         print("\n⚠️  기업 관련 마켓을 찾지 못했습니다.")
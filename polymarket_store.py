@@ -0,0 +1,256 @@
+"""
+Polymarket Market Store - SQLite 저장소
+=======================================
+기업 관련 마켓을 SQLite에 upsert하고, 기업/카테고리/정보 우위 여부로
+인덱스 조회합니다. (CSV 전체 재작성 대체)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Vercel 등 읽기 전용 환경에서는 POLYMARKET_DB_PATH로 /tmp 경로 지정
+DEFAULT_DB_PATH = os.environ.get('POLYMARKET_DB_PATH', os.path.join(SCRIPT_DIR, 'polymarket_markets.db'))
+
+# markets 테이블 컬럼 (filter_company_markets 결과 컬럼과 동일한 이름)
+MARKET_COLUMNS = [
+    'conditionId', 'slug', 'title', 'description', 'link',
+    'is_company_related', 'matched_companies', 'has_insider_potential', 'insider_signal', 'is_new', 'scraped_at',
+    'volume', 'liquidity', 'best_bid', 'best_ask', 'midpoint', 'spread', 'bid_depth', 'ask_depth',
+    'clobTokenIds', 'tags', 'outcome_books',
+]
+BOOL_COLUMNS = ('is_company_related', 'has_insider_potential', 'is_new')
+# Gamma 거래량/유동성과 CLOB 호가 (값이 없으면 NULL)
+REAL_COLUMNS = ('volume', 'liquidity', 'best_bid', 'best_ask', 'midpoint', 'spread', 'bid_depth', 'ask_depth')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    conditionId TEXT PRIMARY KEY,
+    slug TEXT,
+    title TEXT NOT NULL,
+    description TEXT,
+    link TEXT,
+    is_company_related INTEGER NOT NULL DEFAULT 1,
+    matched_companies TEXT,
+    has_insider_potential INTEGER NOT NULL DEFAULT 0,
+    insider_signal TEXT,
+    is_new INTEGER NOT NULL DEFAULT 0,
+    scraped_at TEXT,
+    volume REAL,
+    liquidity REAL,
+    best_bid REAL,
+    best_ask REAL,
+    midpoint REAL,
+    spread REAL,
+    bid_depth REAL,
+    ask_depth REAL,
+    clobTokenIds TEXT,
+    tags TEXT,
+    outcome_books TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_markets_slug ON markets(slug);
+CREATE INDEX IF NOT EXISTS idx_markets_scraped_at ON markets(scraped_at);
+CREATE INDEX IF NOT EXISTS idx_markets_insider ON markets(has_insider_potential);
+
+-- 마켓 ↔ 매칭 기업 (기업별 조회용)
+CREATE TABLE IF NOT EXISTS market_companies (
+    company TEXT NOT NULL,
+    conditionId TEXT NOT NULL,
+    PRIMARY KEY (company, conditionId)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_market_companies_condition ON market_companies(conditionId);
+
+-- 마켓 ↔ 수집 카테고리 (카테고리 없이 수집한 경우 'all')
+CREATE TABLE IF NOT EXISTS market_categories (
+    category TEXT NOT NULL,
+    conditionId TEXT NOT NULL,
+    PRIMARY KEY (category, conditionId)
+) WITHOUT ROWID;
+
+-- 카테고리별 마지막 발행 스냅샷 (새로고침 데몬이 기록, 핸들러는 읽기만)
+CREATE TABLE IF NOT EXISTS snapshots (
+    category TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    refreshed_at TEXT NOT NULL,
+    market_count INTEGER NOT NULL,
+    duration_sec REAL
+);
+"""
+
+
+def market_key(market: Dict) -> str:
+    """저장 키: conditionId, 없으면 slug나 link (HTML 폴백 마켓)"""
+    return market.get('conditionId') or market.get('slug') or market.get('link') or market.get('title', '')
+
+
+class MarketStore:
+    """SQLite 기반 마켓 저장소 (스레드 간 공유 가능)"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+
+    def _migrate(self):
+        """이전 버전 DB에 없는 컬럼 추가"""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(markets)")}
+        for column in MARKET_COLUMNS:
+            if column not in existing:
+                if column in BOOL_COLUMNS:
+                    column_type = 'INTEGER NOT NULL DEFAULT 0'
+                else:
+                    column_type = 'REAL' if column in REAL_COLUMNS else 'TEXT'
+                self._conn.execute(f"ALTER TABLE markets ADD COLUMN {column} {column_type}")
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _market_rows(self, df: pd.DataFrame):
+        """DataFrame → (markets 행, (기업, 키) 쌍, 키 목록)"""
+        rows = []
+        companies = []
+        keys = []
+        for market in df.to_dict('records'):
+            key = market_key(market)
+            if not key:
+                continue
+            keys.append(key)
+            row = [key] + [market.get(column) for column in MARKET_COLUMNS[1:]]
+            for i, column in enumerate(MARKET_COLUMNS):
+                if column in BOOL_COLUMNS:
+                    row[i] = int(bool(row[i])) if pd.notna(row[i]) else 0
+                elif column in REAL_COLUMNS:
+                    row[i] = float(row[i]) if row[i] is not None and pd.notna(row[i]) else None
+                elif column == 'clobTokenIds' and not isinstance(row[i], (str, type(None))):
+                    # 토큰 id 리스트는 JSON 문자열로 저장 (parse_token_ids로 복원)
+                    row[i] = json.dumps(list(row[i]))
+            rows.append(row)
+            for company in str(market.get('matched_companies') or '').split(', '):
+                if company:
+                    companies.append((company, key))
+        return rows, companies, keys
+
+    def _write_markets(self, rows: List, companies: List, keys: List[str], category: Optional[str]):
+        # 호출자가 잠금과 트랜잭션을 잡은 상태에서 실행
+        columns = ', '.join(MARKET_COLUMNS)
+        placeholders = ', '.join('?' for _ in MARKET_COLUMNS)
+        updates = ', '.join(f"{column}=excluded.{column}" for column in MARKET_COLUMNS[1:])
+        self._conn.executemany(
+            f"INSERT INTO markets ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT(conditionId) DO UPDATE SET {updates}",
+            rows,
+        )
+        self._conn.executemany("DELETE FROM market_companies WHERE conditionId = ?", [(key,) for key in keys])
+        self._conn.executemany("INSERT OR IGNORE INTO market_companies (company, conditionId) VALUES (?, ?)", companies)
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO market_categories (category, conditionId) VALUES (?, ?)",
+            [(category or 'all', key) for key in keys],
+        )
+
+    def _prune_category(self, keys: List[str], category: Optional[str]):
+        # 카테고리의 새 목록에 없는 마켓 연결을 지우고, 어느 카테고리에도 없는 마켓은 삭제
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS published_keys (conditionId TEXT PRIMARY KEY)")
+        self._conn.execute("DELETE FROM published_keys")
+        self._conn.executemany("INSERT OR IGNORE INTO published_keys (conditionId) VALUES (?)", [(key,) for key in keys])
+        self._conn.execute(
+            "DELETE FROM market_categories WHERE category = ? "
+            "AND conditionId NOT IN (SELECT conditionId FROM published_keys)",
+            (category or 'all',),
+        )
+        self._conn.execute("DELETE FROM markets WHERE conditionId NOT IN (SELECT conditionId FROM market_categories)")
+        self._conn.execute("DELETE FROM market_companies WHERE conditionId NOT IN (SELECT conditionId FROM markets)")
+
+    def upsert_markets(self, df: pd.DataFrame, category: Optional[str] = None) -> int:
+        """filter_company_markets 결과를 upsert, 저장한 마켓 수 반환"""
+        if df is None or len(df) == 0:
+            return 0
+
+        rows, companies, keys = self._market_rows(df)
+        with self._lock, self._conn:
+            self._write_markets(rows, companies, keys, category)
+        return len(rows)
+
+    def publish_snapshot(self, df: pd.DataFrame, category: Optional[str] = None,
+                         duration_sec: Optional[float] = None, complete: bool = False) -> int:
+        """수집 결과를 반영하고 카테고리 스냅샷 버전을 올림, 새 버전 반환
+
+        complete=True(모든 페이지를 가져온 수집)이면 같은 트랜잭션에서 이번 목록에 없는
+        카테고리 마켓을 지웁니다. 일부만 수집한 결과는 upsert만 해서 기존 행을 남깁니다.
+        """
+        rows, companies, keys = self._market_rows(df) if df is not None else ([], [], [])
+        with self._lock, self._conn:
+            self._write_markets(rows, companies, keys, category)
+            if complete:
+                self._prune_category(keys, category)
+            self._conn.execute(
+                "INSERT INTO snapshots (category, version, refreshed_at, market_count, duration_sec) "
+                "VALUES (?, 1, ?, ?, ?) "
+                "ON CONFLICT(category) DO UPDATE SET version=version+1, refreshed_at=excluded.refreshed_at, "
+                "market_count=excluded.market_count, duration_sec=excluded.duration_sec",
+                (category or 'all', datetime.now().isoformat(), len(rows), duration_sec),
+            )
+            row = self._conn.execute("SELECT version FROM snapshots WHERE category = ?", (category or 'all',)).fetchone()
+        return row[0]
+
+    def snapshot_info(self, category: Optional[str] = None) -> Optional[Dict]:
+        """카테고리의 마지막 발행 스냅샷 정보 (발행된 적 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, refreshed_at, market_count, duration_sec FROM snapshots WHERE category = ?",
+                (category or 'all',),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('version', 'refreshed_at', 'market_count', 'duration_sec'), row))
+
+    def query_markets(self, category: Optional[str] = None, companies: Optional[Iterable[str]] = None,
+                      insider_only: bool = False, limit: Optional[int] = None,
+                      tag: Optional[str] = None) -> pd.DataFrame:
+        """카테고리/기업/정보 우위 여부/태그로 인덱스 조회 (최신 수집 순)
+
+        tag는 마켓 태그 slug (예: 'tech')로, 전체 수집 스냅샷('all')에서 카테고리 뷰를 고를 때 씁니다.
+        """
+        conditions = []
+        params: List = []
+        if category:
+            conditions.append("conditionId IN (SELECT conditionId FROM market_categories WHERE category = ?)")
+            params.append(category)
+        if tag:
+            conditions.append("(', ' || tags || ', ') LIKE ?")
+            params.append(f"%, {tag.lower()}, %")
+        companies = list(companies or [])
+        if companies:
+            placeholders = ', '.join('?' for _ in companies)
+            conditions.append(f"conditionId IN (SELECT conditionId FROM market_companies WHERE company IN ({placeholders}))")
+            params.extend(companies)
+        if insider_only:
+            conditions.append("has_insider_potential = 1")
+
+        sql = f"SELECT {', '.join(MARKET_COLUMNS)} FROM markets"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY scraped_at DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        for column in BOOL_COLUMNS:
+            df[column] = df[column].astype(bool)
+        for column in REAL_COLUMNS:
+            df[column] = df[column].astype(float)
+        return df
@@ -0,0 +1,206 @@
+"""
+Rate Limiter - Token Bucket
+===========================
+Python HTTP 호출용 토큰 버킷 Rate Limiter입니다.
+Gamma/Data API 예산은 app/lib/rateLimiter.ts의 RATE_LIMITS와 동일하며,
+공식 문서: https://docs.polymarket.com/quickstart/introduction/rate-limits
+
+예산은 IP 단위이므로 같은 호스트의 프로세스(serve 데몬, 대시보드 RefreshJob,
+api/ 핸들러, Binance 스크립트)가 버킷 하나를 나눠 씁니다. 버킷 잔고는
+RATE_LIMIT_STATE_DIR(기본: 임시 디렉터리)의 상태 파일에 두고 fcntl 잠금으로
+갱신합니다. fcntl이 없거나(Windows) 상태 파일을 쓸 수 없으면 프로세스별 버킷으로
+동작하므로, 그때는 워커를 여러 개 띄우면 예산을 넘을 수 있습니다.
+"""
+
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import fcntl  # 옵션: 프로세스 간 예산 공유 (POSIX)
+except ImportError:
+    fcntl = None
+
+# 엔드포인트별 예산 (window_sec 동안 max_requests 요청 / Binance는 weight)
+RATE_LIMITS = {
+    'GAMMA_GENERAL': {'max_requests': 750, 'window_sec': 10, 'name': 'GAMMA General'},
+    'GAMMA_MARKETS': {'max_requests': 125, 'window_sec': 10, 'name': 'GAMMA /markets'},
+    'GAMMA_TAGS': {'max_requests': 100, 'window_sec': 10, 'name': 'GAMMA Tags'},
+    'DATA_API_GENERAL': {'max_requests': 200, 'window_sec': 10, 'name': 'Data API General'},
+    'CLOB_GENERAL': {'max_requests': 5000, 'window_sec': 10, 'name': 'CLOB General'},
+    'CLOB_BOOKS': {'max_requests': 50, 'window_sec': 10, 'name': 'CLOB /books'},
+    # Binance USDⓈ-M Futures: IP당 2400 weight / 1분
+    'BINANCE_WEIGHT': {'max_requests': 2400, 'window_sec': 60, 'name': 'Binance Futures Weight'},
+    # polymarket.com HTML 페이지 (공식 예산 없음, 기존 1초 간격 유지)
+    'POLYMARKET_WEB': {'max_requests': 10, 'window_sec': 10, 'name': 'Polymarket Web'},
+}
+
+# getMinDelay와 동일하게 10% 여유를 둠
+SAFETY_MARGIN = 0.1
+
+# 프로세스 간 공유 버킷 상태 파일 디렉터리
+STATE_DIR = os.environ.get('RATE_LIMIT_STATE_DIR', os.path.join(tempfile.gettempdir(), 'polymarket_rate_limits'))
+
+
+class TokenBucket:
+    """스레드 안전한 토큰 버킷
+
+    rate(토큰/초)로 채워지고 최대 capacity개까지 쌓입니다.
+    acquire()는 토큰이 모일 때까지 대기합니다.
+    """
+
+    def __init__(self, rate: float, capacity: float, name: str = ""):
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict, **kwargs) -> "TokenBucket":
+        """RATE_LIMITS 항목으로 버킷 생성
+
+        어떤 window 구간에서도 (capacity + rate * window)가 예산을 넘지 않도록
+        rate는 예산의 90%, 버스트 capacity는 예산의 10%로 설정합니다.
+        """
+        max_requests = config['max_requests']
+        window_sec = config['window_sec']
+        rate = max_requests * (1 - SAFETY_MARGIN) / window_sec
+        capacity = max(1.0, max_requests * SAFETY_MARGIN)
+        return cls(rate, capacity, config.get('name', ''), **kwargs)
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """토큰이 있으면 즉시 차감하고 True, 없으면 False"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """토큰을 차감하고 필요한 만큼 대기, 대기한 시간(초) 반환"""
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # 부족분은 미리 차감(음수 잔고)하고 채워질 때까지 대기 → 대기 순서가 보장됨
+            self._tokens -= tokens
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+
+class SharedTokenBucket(TokenBucket):
+    """상태 파일(잔고, 갱신 시각)을 잠그고 갱신하여 여러 프로세스가 함께 쓰는 토큰 버킷
+
+    시각은 프로세스 간에 비교할 수 있도록 time.time()을 씁니다.
+    상태 파일을 다루다 실패하면 이 프로세스만의 버킷(TokenBucket 동작)으로 대신합니다.
+    """
+
+    _STATE = struct.Struct('dd')
+
+    def __init__(self, rate: float, capacity: float, name: str = "", path: Optional[str] = None):
+        super().__init__(rate, capacity, name)
+        self.path = path
+
+    def _take(self, tokens: float, allow_debt: bool) -> Optional[float]:
+        """파일 잔고를 채우고 tokens만큼 차감한 잔고 반환 (allow_debt=False이고 부족하면 차감 없이 None)"""
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                now = time.time()
+                data = os.pread(fd, self._STATE.size, 0)
+                if len(data) == self._STATE.size:
+                    balance, updated_at = self._STATE.unpack(data)
+                    balance = min(self.capacity, balance + max(0.0, now - updated_at) * self.rate)
+                else:
+                    balance = self.capacity
+                if balance < tokens and not allow_debt:
+                    result = None
+                else:
+                    balance -= tokens
+                    result = balance
+                os.pwrite(fd, self._STATE.pack(balance, now), 0)
+                return result
+            finally:
+                os.close(fd)  # 닫으면 잠금도 풀림
+
+    def _fall_back(self, e: OSError):
+        print(f"Rate limiter state file unavailable ({self.name}): {e}. 프로세스별 버킷으로 동작합니다.")
+        self.path = None
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        if self.path:
+            try:
+                return self._take(tokens, allow_debt=False) is not None
+            except OSError as e:
+                self._fall_back(e)
+        return super().try_acquire(tokens)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        if self.path:
+            tokens = min(tokens, self.capacity)
+            try:
+                balance = self._take(tokens, allow_debt=True)
+            except OSError as e:
+                self._fall_back(e)
+            else:
+                wait_time = -balance / self.rate if balance < 0 else 0.0
+                if wait_time > 0:
+                    time.sleep(wait_time)
+                return wait_time
+        return super().acquire(tokens)
+
+
+def _create_limiter(name: str) -> TokenBucket:
+    config = RATE_LIMITS[name]
+    if fcntl is not None:
+        try:
+            os.makedirs(STATE_DIR, exist_ok=True)
+            return SharedTokenBucket.from_config(config, path=os.path.join(STATE_DIR, f"{name}.bucket"))
+        except OSError as e:
+            print(f"Rate limiter state dir unavailable ({STATE_DIR}): {e}. 프로세스별 버킷으로 동작합니다.")
+    return TokenBucket.from_config(config)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> TokenBucket:
+    """엔드포인트별 버킷 반환 (가능하면 같은 호스트의 모든 프로세스가 공유)"""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _create_limiter(name)
+            _limiters[name] = limiter
+        return limiter
+
+
+def acquire(*names: str, tokens: float = 1.0) -> float:
+    """여러 예산(예: GAMMA_GENERAL + GAMMA_MARKETS)에서 차례로 토큰 차감"""
+    return sum(get_limiter(name).acquire(tokens) for name in names)
+
+
+def binance_klines_weight(limit: int) -> int:
+    """Binance Futures /fapi/v1/klines 요청 weight (limit에 따라 다름)"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
@@ -0,0 +1,110 @@
+"""
+Refresh Job - 백그라운드 새로고침 작업
+======================================
+대시보드의 "데이터 새로고침"을 별도 스레드에서 실행합니다. 수집하는 동안
+화면은 이전 스냅샷을 그대로 보여주면서 진행 상황(페이지/마켓/분류 수)을 읽어
+표시하고, 수집이 끝나면 저장소에 스냅샷을 한 번에 발행합니다.
+
+작업은 카테고리별로 프로세스에 하나만 실행됩니다 (여러 세션이 동시에 눌러도 공유).
+"""
+
+import itertools
+import threading
+import time
+from typing import Dict, Optional
+
+from polymarket_scraper import PolymarketScraper, is_complete_crawl
+from polymarket_store import MarketStore
+
+STAGE_LABELS = {
+    'start': "시작",
+    'fetch': "마켓 수집",
+    'classify': "기업 마켓 분류",
+    'enrich': "CLOB 호가 조회",
+    'publish': "스냅샷 발행",
+    'done': "완료",
+    'failed': "실패",
+}
+
+_job_ids = itertools.count(1)
+
+
+class RefreshJob:
+    """카테고리 하나의 수집 → 발행 작업 (진행 상황은 스레드 안전하게 읽을 수 있음)"""
+
+    def __init__(self, store: MarketStore, category: Optional[str] = None, max_pages: int = 5,
+                 use_selenium: bool = False, incremental: bool = True, enrich: bool = True):
+        self.job_id = next(_job_ids)
+        self.store = store
+        self.category = category
+        self.options = {'max_pages': max_pages, 'use_selenium': use_selenium, 'incremental': incremental,
+                        'enrich': enrich}
+        self._status = {
+            'stage': 'start', 'pages': 0, 'markets': 0, 'classified': 0,
+            'started_at': time.time(), 'finished_at': None, 'version': None, 'error': None,
+        }
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"refresh-{category or 'all'}")
+
+    def start(self) -> "RefreshJob":
+        self._thread.start()
+        return self
+
+    @property
+    def running(self) -> bool:
+        with self._lock:
+            return self._status['finished_at'] is None
+
+    def _update(self, **values):
+        with self._lock:
+            self._status.update(values)
+
+    def status(self) -> Dict:
+        """진행 상황 사본 (stage, pages, markets, classified, elapsed, version, error, running)"""
+        with self._lock:
+            status = dict(self._status)
+        status['running'] = status['finished_at'] is None
+        status['elapsed'] = (status['finished_at'] or time.time()) - status['started_at']
+        return status
+
+    def _run(self):
+        started = time.monotonic()
+        try:
+            df = PolymarketScraper().scrape_all_markets(category=self.category, progress=self._update,
+                                                        **self.options)
+            if len(df) == 0:
+                # 수집 실패로 빈 결과면 이전 스냅샷 유지
+                self._update(stage='failed', error="데이터를 가져오지 못했습니다. 이전 스냅샷을 유지합니다.")
+                return
+            self._update(stage='publish', classified=len(df))
+            # 모든 페이지를 가져온 수집이면 목록에서 빠진(종료된) 마켓도 저장소에서 제거
+            version = self.store.publish_snapshot(df, category=self.category,
+                                                  duration_sec=time.monotonic() - started,
+                                                  complete=is_complete_crawl(df))
+            self._update(stage='done', version=version)
+        except Exception as e:
+            # 일부 페이지 실패(IncompleteCrawlError) 포함 → 이전 스냅샷 유지
+            print(f"Refresh failed ({self.category or 'all'}): {e}")
+            self._update(stage='failed', error=f"{e} (이전 스냅샷을 유지합니다)")
+        finally:
+            self._update(finished_at=time.time())
+
+
+# 카테고리별 마지막 작업 (진행 중이거나 가장 최근에 끝난 작업)
+_jobs: Dict[Optional[str], RefreshJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def start_refresh(store: MarketStore, category: Optional[str] = None, **options) -> RefreshJob:
+    """카테고리 새로고침 시작 (이미 진행 중이면 그 작업을 반환)"""
+    with _jobs_lock:
+        job = _jobs.get(category)
+        if job is None or not job.running:
+            job = _jobs[category] = RefreshJob(store, category, **options).start()
+        return job
+
+
+def get_refresh_job(category: Optional[str] = None) -> Optional[RefreshJob]:
+    """카테고리의 마지막 새로고침 작업 (없으면 None)"""
+    with _jobs_lock:
+        return _jobs.get(category)
@@ -0,0 +1,85 @@
+"""
+SWR Cache - stale-while-revalidate 결과 캐시
+============================================
+키별로 계산 결과를 TTL 동안 그대로 돌려주고, TTL이 지난 뒤 stale_ttl 동안은
+이전 결과를 즉시 돌려주면서 백그라운드에서 한 번만 다시 계산합니다.
+같은 키를 동시에 요청하면 진행 중인 계산 하나를 함께 기다립니다 (single-flight).
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class StaleWhileRevalidateCache:
+    """스레드 안전한 키별 stale-while-revalidate 캐시"""
+
+    def __init__(self, ttl: float, stale_ttl: float, name: str = ""):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.name = name
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _run(self, key: Hashable, loader: Callable[[], Any], future: Future):
+        """loader 실행 후 결과 저장, 기다리는 호출자들에게 전달"""
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Any], future: Future):
+        def run():
+            self._run(key, loader, future)
+            if future.exception() is not None:
+                # 이전 결과는 stale_ttl이 끝날 때까지 계속 사용
+                print(f"Background refresh failed ({self.name} {key}): {future.exception()}")
+
+        threading.Thread(target=run, daemon=True, name=f"swr-refresh-{self.name}").start()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """캐시된 값 반환 (없거나 만료되었으면 계산, stale이면 즉시 반환 후 백그라운드 갱신)"""
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            age = now - entry[1] if entry else None
+            if entry and age < self.ttl:
+                return entry[0]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+            if entry and age < self.ttl + self.stale_ttl:
+                if owner:
+                    self._refresh_in_background(key, loader, future)
+                return entry[0]
+
+        if owner:
+            self._run(key, loader, future)
+        return future.result()
+
+    def peek(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """(값, 경과 시간) 반환, 없으면 None (계산을 일으키지 않음)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return (entry[0], time.monotonic() - entry[1]) if entry else None
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """키 하나 또는 전체 캐시 삭제 (진행 중인 계산은 그대로 끝남)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)